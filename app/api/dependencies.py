@@ -0,0 +1,79 @@
+"""This module defines the FastAPI dependencies shared by the API routes."""
+
+from __future__ import annotations
+
+from functools import lru_cache
+
+from app.models.github_webhook_schema import (FullRepoReview, GithubComment,
+                                              GitHubWebhookPayload)
+from app.models.prompt_schema import PromptPayload
+from app.services.pr_processing import PRProcessor
+from app.utilities.github_integration import GitHubIntegration
+from app.utilities.openai_integration import (OpenAIIntegration,
+                                              get_openai_integration)
+
+
+@lru_cache(maxsize=64)
+def _github_integration(user_login: str | None, repo_full_name: str) -> GitHubIntegration:
+    """Builds one GitHubIntegration per user and repository and reuses it afterwards."""
+    return GitHubIntegration(user_login=user_login, repo_full_name=repo_full_name)
+
+
+def get_github_integration(payload: GithubComment) -> GitHubIntegration:
+    """Resolves the cached GitHub integration for the repository named in the request.
+
+    Args:
+        payload (GithubComment): The request body naming the repository and user.
+
+    Returns:
+        GitHubIntegration: The shared integration for that user and repository.
+    """
+    return _github_integration(payload.user_login, payload.repository_name)
+
+
+@lru_cache(maxsize=256)
+def _pr_processor(
+    user_login: str | None, repo_full_name: str, gpt_model: str | None
+) -> PRProcessor:
+    """Builds one PRProcessor per user, repository and model and reuses it afterwards."""
+    return PRProcessor(
+        user_login=user_login, repo_full_name=repo_full_name, gpt_model=gpt_model
+    )
+
+
+def get_pr_processor(payload: FullRepoReview) -> PRProcessor:
+    """Resolves the cached PR processor for the repository and model named in the request.
+
+    Args:
+        payload (FullRepoReview): The request body naming the repository, user and model.
+
+    Returns:
+        PRProcessor: The shared processor for that combination.
+    """
+    return _pr_processor(payload.user_login, payload.repository_name, payload.gpt_model)
+
+
+def get_webhook_pr_processor(payload: GitHubWebhookPayload) -> PRProcessor:
+    """Resolves the cached PR processor for the repository and sender of a webhook event.
+
+    Webhooks do not name a model, so the configured default model is used.
+
+    Args:
+        payload (GitHubWebhookPayload): The decoded webhook payload.
+
+    Returns:
+        PRProcessor: The shared processor for that repository and sender.
+    """
+    return _pr_processor(payload.sender.login, payload.repository.full_name, None)
+
+
+def get_prompt_openai_integration(payload: PromptPayload) -> OpenAIIntegration:
+    """Resolves the cached OpenAI integration for the model named in a prompt request.
+
+    Args:
+        payload (PromptPayload): The request body naming the model.
+
+    Returns:
+        OpenAIIntegration: The shared integration for that model.
+    """
+    return get_openai_integration(model=payload.gpt_model)
@@ -4,21 +4,30 @@ from __future__ import annotations
 
 import logging
 
-from fastapi import APIRouter, Body
+import msgspec
+from fastapi import (APIRouter, BackgroundTasks, Body, Depends, HTTPException,
+                     Request, Response)
 
+from app.api.dependencies import (get_github_integration, get_pr_processor,
+                                  get_prompt_openai_integration,
+                                  get_webhook_pr_processor)
 from app.models.github_webhook_schema import (FullRepoReview, GithubComment,
-                                              GitHubWebhookPayload)
+                                              decode_webhook_payload)
 from app.models.prompt_schema import PromptPayload
 from app.services.gpt.gpt_requests import process_prompt
 from app.services.pr_processing import PRProcessor
-from app.services.webhooks.github_webhooks import handle_github_webhook
+from app.services.webhooks.github_webhooks import (handle_github_webhook,
+                                                   is_reviewed_action,
+                                                   is_reviewed_event)
+from app.utilities.github_integration import GitHubIntegration
+from app.utilities.openai_integration import OpenAIIntegration
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
 
 @router.get("/status/")
-def get_status() -> dict:
+async def get_status() -> dict:
     """Get the status of the service.
 
     Returns:
@@ -28,81 +37,126 @@ def get_status() -> dict:
 
 
 @router.post("/prompt/")
-def process_prompt_endpoint(payload: PromptPayload) -> dict:
+async def process_prompt_endpoint(
+    payload: PromptPayload = Body(...),
+    openai_integration: OpenAIIntegration = Depends(get_prompt_openai_integration),
+) -> dict:
     """Processes a given prompt using GPT and returns the response.
 
     Args:
         payload (PromptPayload): The payload containing the prompt.
+        openai_integration (OpenAIIntegration): The shared integration for the payload's model.
 
     Returns:
         dict: The processed prompt response.
     """
-    return process_prompt(payload)
+    return await process_prompt(payload, openai_integration)
 
 
-@router.post("/github-webhook/", response_model=dict)
-def github_webhook_endpoint(payload: GitHubWebhookPayload) -> dict:
+@router.post("/github-webhook/", response_model=dict, status_code=202)
+async def github_webhook_endpoint(
+    request: Request, response: Response, background_tasks: BackgroundTasks
+) -> dict:
     """Endpoint for processing GitHub webhook payloads.
 
+    The body is decoded with msgspec rather than bound to a Pydantic model, since
+    webhook payloads are large and only a handful of their fields are used. The
+    review itself runs after the 202 response has been sent. Events that cannot
+    trigger a review are acknowledged with 200 before any processor is resolved.
+
     Args:
-        payload (GitHubWebhookPayload): The GitHub webhook payload.
+        request (Request): The incoming request carrying the GitHub webhook payload.
+        response (Response): The outgoing response, whose status ignored events change.
+        background_tasks (BackgroundTasks): Runs the queued review after responding.
 
     Returns:
-        dict: A dictionary indicating the webhook was processed successfully.
+        dict: A dictionary indicating the webhook was accepted or ignored.
     """
-    return handle_github_webhook(payload)
+    event = request.headers.get("X-GitHub-Event")
+    if not is_reviewed_event(event):
+        response.status_code = 200
+        return {"message": f"Ignored {event} event"}
+    try:
+        payload = decode_webhook_payload(await request.body())
+    except msgspec.DecodeError as e:
+        raise HTTPException(status_code=422, detail=str(e)) from e
+    if not is_reviewed_action(payload):
+        response.status_code = 200
+        return {"message": f"Ignored pull request {payload.action} action"}
+    return await handle_github_webhook(
+        payload, get_webhook_pr_processor(payload), background_tasks
+    )
 
 
 @router.post("/review_all_open_PRs/")
-def review_all_open_pull_requests_endpoint(payload: FullRepoReview = Body(...)) -> dict:
+async def review_all_open_pull_requests_endpoint(
+    background_tasks: BackgroundTasks,
+    payload: FullRepoReview = Body(...),
+    processor: PRProcessor = Depends(get_pr_processor),
+    mode: str = "async",
+) -> dict:
     """Reviews all open pull requests for the specified repository.
 
     Args:
+        background_tasks (BackgroundTasks): Used to collect batch results after responding.
         payload (FullRepoReview): Information about the repository and user.
+        processor (PRProcessor): The shared processor for the payload's repository and model.
+        mode (str): ``async`` to review immediately, or ``batch`` to submit every review
+            as one OpenAI batch job whose results are posted once it completes.
 
     Returns:
-        dict: A summary of the review process.
+        dict: A summary of the review process, or the id of the submitted batch, which is
+        None when there was nothing to review.
     """
-    processor = PRProcessor(
-        user_login=payload.user_login,
-        repo_full_name=payload.repository_name,
-        gpt_model=payload.gpt_model,
-    )
-    return processor.review_all_open_pull_requests(payload.process_diffs_only)
+    if mode == "batch":
+        batch_id, targets = await processor.submit_review_batch(
+            payload.process_diffs_only
+        )
+        if batch_id is None:
+            return {"batch_id": None}
+        background_tasks.add_task(
+            processor.post_batch_reviews,
+            batch_id,
+            targets,
+            payload.process_diffs_only,
+        )
+        return {"batch_id": batch_id}
+    if mode != "async":
+        raise HTTPException(status_code=400, detail=f"Unknown review mode: {mode}")
+    return await processor.review_all_open_pull_requests(payload.process_diffs_only)
 
 
 @router.post("/generate_PR_summary/")
-def generate_pr_summary_endpoint(payload: FullRepoReview = Body(...)) -> dict:
+async def generate_pr_summary_endpoint(
+    payload: FullRepoReview = Body(...),
+    processor: PRProcessor = Depends(get_pr_processor),
+) -> list[dict]:
     """Generates a summary for all pull requests in the specified repository.
 
     Args:
         payload (FullRepoReview): Information about the repository and user.
+        processor (PRProcessor): The shared processor for the payload's repository and model.
 
     Returns:
-        dict: A dictionary containing summaries for all PRs.
+        list[dict]: The PR number and summary of every open PR.
     """
-    processor = PRProcessor(
-        user_login=payload.user_login,
-        repo_full_name=payload.repository_name,
-        gpt_model=payload.gpt_model,
-    )
-    return processor.generate_all_prs_summary(payload.process_diffs_only)
+    summaries = await processor.generate_all_prs_summary(payload.process_diffs_only)
+    return [summary.as_response() for summary in summaries]
 
 
 @router.post("/add_github_comment/")
-def add_github_comment(payload: GithubComment = Body(...)) -> dict:
+async def add_github_comment(
+    payload: GithubComment = Body(...),
+    gh_client: GitHubIntegration = Depends(get_github_integration),
+) -> dict:
     """Adds a comment to a GitHub pull request.
 
     Args:
         payload (GithubComment): The payload containing the PR number and comment.
+        gh_client (GitHubIntegration): The shared integration for the payload's repository.
 
     Returns:
         dict: A message indicating the comment was added successfully.
     """
-    processor = PRProcessor(
-        user_login=payload.user_login,
-        repo_full_name=payload.repository_name,
-        gpt_model="",
-    )
-    processor.gh_client.post_comment_on_pr(payload.pr_num, payload.comment)
+    await gh_client.post_comment_on_pr(payload.pr_num, payload.comment)
     return {"message": "Comment added successfully."}
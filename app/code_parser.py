@@ -3,20 +3,103 @@
 from __future__ import annotations
 
 import ast
-
-import jsmin
+import asyncio
+import functools
+import hashlib
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from cachetools import LRUCache
 from python_minifier import minify
 
+try:
+    from rjsmin import jsmin
+except ImportError:  # the C-accelerated minifier is not available
+    from jsmin import jsmin
+
 from app.config_loader import get_config
 
+__all__ = [
+    "BaseParser",
+    "JavascriptParser",
+    "PythonParser",
+    "get_parser_for_language",
+    "get_parser_processes",
+    "minify_code_async",
+    "parse_functions_async",
+    "shutdown_process_pool",
+]
+
+# Characters of parser results kept in memory; bounding by size rather than by entry
+# count keeps a few minified bundles from taking as much room as a thousand snippets.
+RESULT_CACHE_CHARS = 64 * 1024 * 1024
+
+
+def _result_size(result) -> int:
+    if isinstance(result, tuple):
+        return sum(len(item) for item in result) + 1
+    return len(result) + 1
+
+
+_RESULT_CACHE = LRUCache(maxsize=RESULT_CACHE_CHARS, getsizeof=_result_size)
+_RESULT_CACHE_LOCK = threading.Lock()
+
+
+def _cache_key(parser, method_name: str, content: str, args=(), kwargs=None) -> tuple:
+    digest = hashlib.blake2b(content.encode("utf-8"), digest_size=16).digest()
+    return (type(parser).__name__, method_name, digest, args, tuple((kwargs or {}).items()))
+
+
+def _cache_get(key: tuple):
+    """Returns a cached result, or None on a miss."""
+    with _RESULT_CACHE_LOCK:
+        result = _RESULT_CACHE.get(key)
+    return list(result) if isinstance(result, tuple) else result
+
+
+def _cache_put(key: tuple, result):
+    """Stores a result, unless it is larger than the whole cache, and returns it."""
+    stored = tuple(result) if isinstance(result, list) else result
+    if _result_size(stored) <= RESULT_CACHE_CHARS:
+        with _RESULT_CACHE_LOCK:
+            _RESULT_CACHE[key] = stored
+    return result
+
+
+def _cached_by_content(method):
+    """Caches a pure parser method by a digest of the content it is given.
+
+    List results are stored as tuples so cached entries cannot be mutated by callers.
+    """
+
+    @functools.wraps(method)
+    def wrapper(self, content: str, *args, **kwargs):
+        key = _cache_key(self, method.__name__, content, args, kwargs)
+        result = _cache_get(key)
+        if result is None:
+            result = _cache_put(key, method(self, content, *args, **kwargs))
+        return result
+
+    return wrapper
+
 
 class BaseParser:
     """Base class for language-specific parsers. Defines common interfaces for parsing
     and minifying code."""
 
-    def __init__(self):
-        """Initializes the parser with configuration settings."""
-        self.config = get_config()
+    __slots__ = ()
+
+    # Whether minify_code is implemented; checked before dispatching any minification.
+    supports_minify = False
+
+    @property
+    def config(self) -> dict:
+        """The current configuration settings, resolved on access so that parsers
+        created at import time never read the configuration file themselves and
+        pick up ``reload_config()`` without being rebuilt."""
+        return get_config()
 
     def minify_code(self, content: str) -> str:
         """Minifies the provided code content.
@@ -47,25 +130,59 @@ class BaseParser:
         raise NotImplementedError("Parsing is not implemented for this language.")
 
 
+# Function definitions are dispatched on their exact type; every other statement only
+# has its nested statements visited, as no expression can contain a ``def``.
+_FUNCTION_TYPES = frozenset((ast.FunctionDef, ast.AsyncFunctionDef))
+# Fields holding nested statements, in the order ``ast`` declares them.
+_STATEMENT_FIELDS = ("body", "handlers", "orelse", "finalbody", "cases")
+
+
+def _collect_functions(tree: ast.AST, include_nested: bool = False) -> list:
+    """Collects the source of function definitions in source order, walking statements only.
+
+    Args:
+        tree (ast.AST): The parsed module.
+        include_nested (bool, optional): Whether to descend into function bodies.
+
+    Returns:
+        list: The unparsed function definitions.
+    """
+    functions = []
+    stack = [tree]
+    while stack:
+        node = stack.pop()
+        if type(node) in _FUNCTION_TYPES:
+            functions.append(ast.unparse(node))
+            if not include_nested:
+                continue
+        children = [
+            child for field in _STATEMENT_FIELDS for child in getattr(node, field, ())
+        ]
+        stack.extend(reversed(children))
+    return functions
+
+
 class PythonParser(BaseParser):
     """Parser for Python code. Extends BaseParser to parse and minify Python code."""
 
-    def parse_functions(self, content: str) -> list:
+    __slots__ = ()
+    supports_minify = True
+
+    @_cached_by_content
+    def parse_functions(self, content: str, include_nested: bool = False) -> list:
         """Parses Python code to extract function definitions.
 
         Args:
             content (str): Python code content.
+            include_nested (bool, optional): Whether functions defined inside other functions
+                are returned as separate entries. Defaults to False.
 
         Returns:
             list: A list of string representations of function definitions.
         """
-        root = ast.parse(content)
-        return [
-            ast.unparse(node)
-            for node in ast.walk(root)
-            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef))
-        ]
+        return _collect_functions(ast.parse(content), include_nested)
 
+    @_cached_by_content
     def minify_code(self, content: str) -> str:
         """Minifies Python code using python-minifier.
 
@@ -81,6 +198,9 @@ class PythonParser(BaseParser):
 class JavascriptParser(BaseParser):
     """Parser for JavaScript code. Extends BaseParser to minify JavaScript code."""
 
+    __slots__ = ()
+    supports_minify = True
+
     def parse_functions(self, content: str) -> list:
         """Placeholder method for JavaScript function parsing.
 
@@ -93,8 +213,9 @@ class JavascriptParser(BaseParser):
         # Placeholder implementation, trying to find appropriate library.
         raise NotImplementedError("Parsing is not implemented for this language")
 
+    @_cached_by_content
     def minify_code(self, content: str) -> str:
-        """Minifies JavaScript code using jsmin.
+        """Minifies JavaScript code using rjsmin, or jsmin where it is not installed.
 
         Args:
             content (str): JavaScript code content.
@@ -102,20 +223,135 @@ class JavascriptParser(BaseParser):
         Returns:
             str: Minified JavaScript code.
         """
-        return jsmin.jsmin(content)
+        return jsmin(content)
+
+
+_PARSERS = {
+    "Python": PythonParser(),
+    "JavaScript": JavascriptParser(),
+}
+_DEFAULT_PARSER = BaseParser()
 
 
 def get_parser_for_language(language: str) -> BaseParser:
     """Factory function to get a parser instance for the given language.
 
+    Parsers are stateless, so a single shared instance per language is returned.
+
     Args:
         language (str): The programming language of the parser.
 
     Returns:
         BaseParser: An instance of a parser for the specified language.
     """
-    parsers = {
-        "Python": PythonParser(),
-        "JavaScript": JavascriptParser(),
-    }
-    return parsers.get(language, BaseParser())
+    return _PARSERS.get(language, _DEFAULT_PARSER)
+
+
+# Inputs smaller than this are handled inline; shipping them to a worker process costs
+# more than the work itself.
+PROCESS_POOL_MIN_SIZE = 4096
+
+_PROCESS_POOL = None
+
+
+def get_parser_processes() -> int:
+    """Returns how many worker processes each server process may start for parsing.
+
+    Read from ``CODEREVIEWBOT_PARSER_PROCESSES`` or ``concurrency.parser_processes``;
+    by default the CPUs are split between the configured uvicorn workers, so that the
+    pools of all workers together do not exceed the CPU count.
+    """
+    config = get_config()
+    configured = os.environ.get(
+        "CODEREVIEWBOT_PARSER_PROCESSES",
+        config.get("concurrency", {}).get("parser_processes"),
+    )
+    if configured:
+        return int(configured)
+    cpus = os.cpu_count() or 1
+    workers = (
+        config.get("operation_mode", {}).get("webhook_server", {}).get("workers") or cpus
+    )
+    return max(1, cpus // workers)
+
+
+def _get_process_pool() -> ProcessPoolExecutor:
+    """Creates the shared worker pool on first use."""
+    global _PROCESS_POOL  # pylint: disable=global-statement
+    if _PROCESS_POOL is None:
+        _PROCESS_POOL = ProcessPoolExecutor(
+            max_workers=get_parser_processes(),
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _PROCESS_POOL
+
+
+def shutdown_process_pool():
+    """Stops the worker pool, if it was started."""
+    global _PROCESS_POOL  # pylint: disable=global-statement
+    if _PROCESS_POOL is not None:
+        _PROCESS_POOL.shutdown(cancel_futures=True)
+        _PROCESS_POOL = None
+
+
+def _run_uncached(language: str, method_name: str, content: str):
+    """Runs a parser method without its result cache, which lives in the parent process.
+
+    Module-level so that worker processes can unpickle it.
+    """
+    parser = get_parser_for_language(language)
+    method = getattr(type(parser), method_name)
+    return getattr(method, "__wrapped__", method)(parser, content)
+
+
+async def _run_cpu_bound(method_name: str, language: str, content: str):
+    """Runs parser work inline for small inputs and on the process pool otherwise.
+
+    Results of pooled work are cached in this process, so a repeated large input never
+    reaches the pool again and workers keep no caches of their own.
+    """
+    parser = get_parser_for_language(language)
+    if len(content) < PROCESS_POOL_MIN_SIZE:
+        return getattr(parser, method_name)(content)
+    key = _cache_key(parser, method_name, content)
+    result = _cache_get(key)
+    if result is None:
+        loop = asyncio.get_running_loop()
+        result = _cache_put(
+            key,
+            await loop.run_in_executor(
+                _get_process_pool(), _run_uncached, language, method_name, content
+            ),
+        )
+    return result
+
+
+async def minify_code_async(content: str, language: str) -> str:
+    """Minifies code without blocking the event loop.
+
+    Args:
+        content (str): The code content to minify.
+        language (str): The programming language of the content.
+
+    Returns:
+        str: The minified code, or the original content if the language has no minifier.
+    """
+    if not get_parser_for_language(language).supports_minify:
+        return content
+    return await _run_cpu_bound("minify_code", language, content)
+
+
+async def parse_functions_async(content: str, language: str) -> list:
+    """Extracts function definitions without blocking the event loop.
+
+    Args:
+        content (str): The code content to parse.
+        language (str): The programming language of the content.
+
+    Raises:
+        NotImplementedError: If parsing is not implemented for the language.
+
+    Returns:
+        list: A list of parsed functions.
+    """
+    return await _run_cpu_bound("parse_functions", language, content)
@@ -2,15 +2,47 @@
 
 from __future__ import annotations
 
+from functools import lru_cache
+
 import yaml
 
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # libyaml bindings are not available
+    from yaml import SafeLoader
+
 
+@lru_cache(maxsize=1)
 def get_config() -> dict:
     """Loads configuration from the YAML file.
 
+    The file is parsed once per process; call ``reload_config()`` to reload it.
+
     Returns:
         dict: Configuration dictionary.
     """
     with open("config/config.yml", encoding="utf-8") as file:  # Specify encoding
-        config = yaml.safe_load(file)
+        config = yaml.load(file, Loader=SafeLoader)
     return config
+
+
+@lru_cache(maxsize=1)
+def get_github_api_keys() -> dict:
+    """Flattens the GitHub API keys from the configuration into a single lookup table.
+
+    Returns:
+        dict: API keys keyed by ``user:<login>``, ``owner:<owner>`` and ``default``.
+    """
+    github_config = get_config().get("github", {})
+    api_keys = {"default": github_config.get("default_api_key")}
+    for login, settings in github_config.get("user_keys", {}).items():
+        api_keys[f"user:{login}"] = settings["api_key"]
+    for owner, settings in github_config.get("repo_owner_keys", {}).items():
+        api_keys[f"owner:{owner}"] = settings["api_key"]
+    return api_keys
+
+
+def reload_config() -> None:
+    """Drops the cached configuration so that it is read again on next access."""
+    get_config.cache_clear()
+    get_github_api_keys.cache_clear()
@@ -2,21 +2,77 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
+import os
+import signal
+from contextlib import asynccontextmanager
 
 import uvicorn
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
+from fastapi.responses import ORJSONResponse
 
 from app.api.routers import router as app_router
+from app.code_parser import shutdown_process_pool
+from app.config_loader import get_config, get_github_api_keys, reload_config
+from app.utilities.github_integration import close_http_clients
+from app.utilities.http_pool import close_http_transport
 
+# CODEREVIEWBOT_LOG_FILE names the log file; set it empty to log to the console only.
+_LOG_FILE = os.environ.get("CODEREVIEWBOT_LOG_FILE", "app.log")
 logging.basicConfig(
     level=logging.INFO,
     format="%(asctime)s - %(levelname)s - %(message)s",
-    handlers=[logging.FileHandler("app.log"), logging.StreamHandler()],
+    handlers=([logging.FileHandler(_LOG_FILE)] if _LOG_FILE else [])
+    + [logging.StreamHandler()],
 )
+logger = logging.getLogger(__name__)
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    """Checks the GitHub credentials and installs the SIGHUP handler on startup, and
+    releases the shared HTTP connection pools and parser workers when the application
+    stops."""
+    if not any(get_github_api_keys().values()):
+        raise RuntimeError("No GitHub API key configured under github in config.yml")
+    # Reload config/config.yml on the next access after a SIGHUP. Every worker process
+    # installs its own handler, so the signal has to be sent to the workers themselves.
+    loop = asyncio.get_running_loop()
+    sighup_handled = False
+    if hasattr(signal, "SIGHUP"):
+        try:
+            loop.add_signal_handler(signal.SIGHUP, reload_config)
+            sighup_handled = True
+        except (NotImplementedError, RuntimeError, ValueError):
+            logger.info("SIGHUP cannot be handled here, config reloads need a restart")
+    yield
+    if sighup_handled:
+        loop.remove_signal_handler(signal.SIGHUP)
+    await close_http_clients()
+    await close_http_transport()
+    shutdown_process_pool()
+
+
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
 app.include_router(app_router)
 
+
+@app.exception_handler(KeyError)
+async def missing_key_handler(_request: Request, exc: KeyError) -> ORJSONResponse:
+    """Answers with a 400 instead of a 500 when a required setting or field is missing."""
+    logger.warning("Missing key while handling request: %s", exc)
+    return ORJSONResponse(status_code=400, content={"detail": f"Missing key: {exc.args[0]}"})
+
 if __name__ == "__main__":
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    server_config = get_config().get("operation_mode", {}).get("webhook_server", {})
+    # "auto" selects uvloop and httptools whenever they are installed.
+    uvicorn.run(
+        "app.main:app",
+        host=server_config.get("host", "0.0.0.0"),
+        port=server_config.get("port", 8000),
+        loop="auto",
+        http="auto",
+        workers=server_config.get("workers") or os.cpu_count(),
+        log_config=None,
+    )
@@ -1,21 +1,67 @@
-"""Module defining Pydantic models for GitHub webhook payloads."""
+"""Module defining the request models for GitHub webhook payloads and repository actions."""
 
 from __future__ import annotations
 
-from pydantic import BaseModel
+import msgspec
+from pydantic import BaseModel, ConfigDict
 
+# Request bodies are only read, never mutated or coerced.
+REQUEST_MODEL_CONFIG = ConfigDict(strict=True, extra="ignore", frozen=True)
 
-class GitHubWebhookPayload(BaseModel):
+
+# Webhook payloads are large (tens of kilobytes) and only a few fields are used, so they
+# are decoded with msgspec, which skips undeclared fields while parsing instead of
+# validating the whole document.
+class WebhookRepository(msgspec.Struct, frozen=True):
+    """The repository a webhook event was sent for."""
+
+    full_name: str
+
+
+class WebhookUser(msgspec.Struct, frozen=True):
+    """The user who triggered a webhook event."""
+
+    login: str
+
+
+class WebhookPullRequest(msgspec.Struct, frozen=True):
+    """The pull request a webhook event refers to."""
+
+    number: int
+
+
+class GitHubWebhookPayload(msgspec.Struct, frozen=True):
     """Defines the structure of a GitHub webhook payload."""
 
-    repository: dict[str, str]
-    sender: dict[str, str]
-    pull_request: dict[str, int]
+    repository: WebhookRepository
+    sender: WebhookUser
+    pull_request: WebhookPullRequest
+    action: str | None = None
+
+
+_WEBHOOK_DECODER = msgspec.json.Decoder(GitHubWebhookPayload)
+
+
+def decode_webhook_payload(body: bytes) -> GitHubWebhookPayload:
+    """Decodes and validates a raw GitHub webhook body.
+
+    Args:
+        body (bytes): The JSON request body.
+
+    Raises:
+        msgspec.DecodeError: If the body is not JSON or not a valid webhook payload.
+
+    Returns:
+        GitHubWebhookPayload: The decoded payload.
+    """
+    return _WEBHOOK_DECODER.decode(body)
 
 
 class GithubComment(BaseModel):
     """Represents a comment on a GitHub pull request."""
 
+    model_config = REQUEST_MODEL_CONFIG
+
     repository_name: str
     user_login: str | None = None
     pr_num: int
@@ -25,6 +71,8 @@ class GithubComment(BaseModel):
 class FullRepoReview(BaseModel):
     """Represents a request for a full repository review."""
 
+    model_config = REQUEST_MODEL_CONFIG
+
     repository_name: str
     gpt_model: str | None = "gpt-3.5-turbo"
     user_login: str | None = None
@@ -0,0 +1,92 @@
+"""Module defining the typed shapes of the OpenAI outputs parsed outside the SDK."""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+
+import msgspec
+
+
+# Batch output files and JSON-mode answers arrive as raw JSON rather than SDK objects;
+# decoding them straight into structs reads only the declared fields and validates their
+# types in one pass.
+class SummaryAndReview(msgspec.Struct, frozen=True):
+    """The JSON object answered by a fused summary and review completion."""
+
+    summary: str
+    review: str
+
+
+class BatchMessage(msgspec.Struct, frozen=True):
+    """The assistant message of a batched completion."""
+
+    content: str | None = None
+
+
+class BatchChoice(msgspec.Struct, frozen=True):
+    """A choice of a batched completion."""
+
+    message: BatchMessage
+
+
+class BatchCompletion(msgspec.Struct, frozen=True):
+    """The body of a successful batched chat completion."""
+
+    choices: list[BatchChoice]
+
+
+class BatchResponse(msgspec.Struct, frozen=True):
+    """The response to one request of a batch; the body is decoded only on success."""
+
+    status_code: int
+    body: msgspec.Raw = msgspec.Raw()
+
+
+class BatchOutputLine(msgspec.Struct, frozen=True):
+    """One line of a batch output file."""
+
+    custom_id: str
+    response: BatchResponse | None = None
+    error: dict | None = None
+
+
+_SUMMARY_AND_REVIEW_DECODER = msgspec.json.Decoder(SummaryAndReview)
+_BATCH_OUTPUT_DECODER = msgspec.json.Decoder(BatchOutputLine)
+_BATCH_COMPLETION_DECODER = msgspec.json.Decoder(BatchCompletion)
+
+
+def decode_summary_and_review(text: str | bytes) -> SummaryAndReview:
+    """Decodes the answer of a fused summary and review completion.
+
+    Args:
+        text (str | bytes): The JSON answer.
+
+    Raises:
+        msgspec.DecodeError: If the answer is not JSON or lacks the summary or review.
+
+    Returns:
+        SummaryAndReview: The decoded answer.
+    """
+    return _SUMMARY_AND_REVIEW_DECODER.decode(text)
+
+
+def decode_batch_output(content: bytes) -> Iterator[tuple[str, str | None, dict | None]]:
+    """Decodes a batch output file into the generated text of each request.
+
+    Args:
+        content (bytes): The JSON lines of the output file.
+
+    Raises:
+        msgspec.DecodeError: If a line is not a valid batch output record.
+
+    Yields:
+        tuple[str, str | None, dict | None]: The custom id of each request, its generated
+        text or None if the request failed, and the reported error.
+    """
+    for record in _BATCH_OUTPUT_DECODER.decode_lines(content):
+        response = record.response
+        if response is None or response.status_code != 200:
+            yield record.custom_id, None, record.error
+            continue
+        completion = _BATCH_COMPLETION_DECODER.decode(response.body)
+        yield record.custom_id, completion.choices[0].message.content, None
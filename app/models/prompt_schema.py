@@ -2,11 +2,13 @@
 
 from __future__ import annotations
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 
 class PromptPayload(BaseModel):
     """Represents the payload for processing a prompt with a specified GPT model."""
 
+    model_config = ConfigDict(strict=True, extra="ignore", frozen=True)
+
     prompt: str
     gpt_model: str | None = "gpt-3.5-turbo"
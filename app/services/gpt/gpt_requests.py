@@ -9,21 +9,27 @@ from __future__ import annotations
 from fastapi import HTTPException
 
 from app.models.prompt_schema import PromptPayload
-from app.utilities.openai_integration import OpenAIIntegration
+from app.utilities.openai_integration import (OpenAIIntegration,
+                                              get_openai_integration)
 
 
-async def process_prompt(payload: PromptPayload):
+async def process_prompt(
+    payload: PromptPayload, openai_integration: OpenAIIntegration | None = None
+):
     """
     Processes a prompt by generating a summary or response using the OpenAI API.
 
     Args:
         payload (PromptPayload): The payload containing the prompt to process.
+        openai_integration (OpenAIIntegration | None): The integration to use, or None
+            for the shared integration of the payload's model.
 
     Returns:
         dict: A dictionary containing the processed prompt result.
     """
     try:
-        openai_integration = OpenAIIntegration(model=payload.gpt_model)
-        return openai_integration.gpt_prompt(payload.prompt)
+        if openai_integration is None:
+            openai_integration = get_openai_integration(model=payload.gpt_model)
+        return await openai_integration.gpt_prompt(payload.prompt)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e)) from e
@@ -2,9 +2,163 @@
 
 from __future__ import annotations
 
-from app.code_parser import get_parser_for_language
+import asyncio
+import hashlib
+import logging
+import re
+from dataclasses import dataclass
+
+from cachetools import TTLCache
+from tenacity import RetryError
+
+from app.code_parser import minify_code_async
+from app.services.salesforce.salesforce_handler import SF_LANGUAGE_TO_PROMPT
 from app.utilities.github_integration import GitHubIntegration
-from app.utilities.openai_integration import OpenAIIntegration
+from app.utilities.openai_integration import (get_max_llm_concurrency,
+                                              get_openai_integration)
+from app.utilities.token_budget import chunk_by_tokens
+
+logger = logging.getLogger(__name__)
+
+# Files longer than this many tokens are summarized in overlapping chunks whose
+# summaries are then combined.
+SUMMARY_CHUNK_TOKENS = 3000
+SUMMARY_CHUNK_OVERLAP_TOKENS = 200
+
+# Files under a quarter of this size are summarized several to a completion, in
+# groups of up to this many characters.
+SUMMARY_BATCH_CHARS = 12000
+
+# Version bumps changing fewer characters than this are not worth a completion.
+TRIVIAL_CHANGE_CHARS = 64
+
+# Languages where indentation carries meaning, so re-indenting is reviewed.
+_INDENTATION_SENSITIVE_LANGUAGES = frozenset(
+    ("Python", "YAML", "Makefile", "Haskell", "CoffeeScript", "Nim", "F#", "Sass", "Pug")
+)
+_VERSION_RE = re.compile(r"\d+(?:\.\d+)+")
+# Dotted numbers are only taken for versions in dependency manifests or on a version key;
+# anywhere else they may be thresholds, timeouts or addresses.
+_MANIFEST_FILENAMES = frozenset(
+    (
+        "setup.py", "setup.cfg", "pyproject.toml", "package.json", "cargo.toml", "go.mod",
+        "pom.xml", "build.gradle", "build.gradle.kts", "gemfile", "composer.json",
+        "chart.yaml", "version", "version.txt",
+    )
+)
+_VERSION_KEY_RE = re.compile(r"version", re.IGNORECASE)
+
+_DIFF_INDICATORS = {
+    True: "This is a diff so treat '+' as additions and '-' as subtractions.",
+    False: "This is a full file, not a diff.",
+}
+# File summary instructions keyed by (process_diffs_only, pr_summary), built once.
+_SUMMARY_PROMPTS = {
+    (diffs, True): (
+        "Summarize this file from a PR in the most condensed format that GPT can understand, "
+        "combining it into a readable format for all files in a GitHub pull request. "
+        f"{indicator} Use shorthand or minimize to use the least amount of tokens if necessary."
+    )
+    for diffs, indicator in _DIFF_INDICATORS.items()
+} | {
+    (diffs, False): f"Summarize this file from a PR. {indicator}"
+    for diffs, indicator in _DIFF_INDICATORS.items()
+}
+
+
+def is_reviewable(language: str) -> bool:
+    """
+    Tells whether files of a language are worth a review: the language was detected, and
+    it is not a Salesforce file type left without a review prompt (Aura, Visualforce,
+    metadata XML).
+
+    Args:
+        language (str): The detected language of a file.
+    """
+    return language != "Unknown" and SF_LANGUAGE_TO_PROMPT.get(language) != ""
+
+
+def _is_manifest(filename: str) -> bool:
+    name = filename.rpartition("/")[2].lower()
+    return (
+        name in _MANIFEST_FILENAMES
+        or name.endswith(".gemspec")
+        or (name.startswith("requirements") and name.endswith(".txt"))
+    )
+
+
+def is_trivial_change(patch: str, language: str, filename: str) -> bool:
+    """
+    Tells whether a diff is not worth summarizing or reviewing: it only changes the
+    whitespace at the start or end of lines, where indentation carries no meaning, or
+    it is a version bump, whose changed lines hold fewer than ``TRIVIAL_CHANGE_CHARS``
+    characters and differ only in dotted version numbers, in a dependency manifest or
+    on a version key.
+
+    Args:
+        patch (str): The unified diff of a file.
+        language (str): The detected language of the file.
+        filename (str): The path of the file.
+    """
+    added, removed = [], []
+    for line in patch.splitlines():
+        if line.startswith("+"):
+            added.append(line[1:])
+        elif line.startswith("-"):
+            removed.append(line[1:])
+
+    # Whitespace inside a line can be part of a token or a string literal, so only the
+    # ends of lines are normalized, and the start only where indentation is cosmetic.
+    strip = str.rstrip if language in _INDENTATION_SENSITIVE_LANGUAGES else str.strip
+    if [strip(line) for line in added if line.strip()] == [
+        strip(line) for line in removed if line.strip()
+    ]:
+        return True
+
+    if sum(map(len, added)) + sum(map(len, removed)) >= TRIVIAL_CHANGE_CHARS:
+        return False
+    manifest = _is_manifest(filename)
+    return (
+        bool(added)
+        and len(added) == len(removed)
+        and all(
+            _VERSION_RE.search(new)
+            and _VERSION_RE.sub("", new) == _VERSION_RE.sub("", old)
+            and (manifest or _VERSION_KEY_RE.search(new))
+            for new, old in zip(added, removed)
+        )
+    )
+
+
+async def minify_for_summary(text: str, language: str, process_diffs_only: bool) -> str:
+    """
+    Minifies the contents of a file before it is summarized. Diffs are not source code
+    and are left as they are, as is code the minifier fails on.
+
+    Args:
+        text (str): The patch or contents of a file.
+        language (str): The detected language of the file.
+        process_diffs_only (bool): Whether ``text`` is a patch.
+    """
+    if process_diffs_only:
+        return text
+    try:
+        return await minify_code_async(text, language)
+    except Exception as e:
+        logger.debug("Summarizing unminified %s code: %s", language, e)
+        return text
+
+
+@dataclass(slots=True)
+class PRSummary:
+    """The summary generated for a pull request."""
+
+    pr_number: int
+    summary: str
+
+    def as_response(self) -> dict:
+        """Returns the summary in the shape served by the API."""
+        return {"PR #": self.pr_number, "Summary": self.summary}
 
 
 class PRProcessor:
@@ -25,14 +179,19 @@ class PRProcessor:
         self.gh_client = GitHubIntegration(
             user_login=user_login, repo_full_name=repo_full_name
         )
-        self.openai_integration = OpenAIIntegration(model=gpt_model)
+        self.max_concurrency = get_max_llm_concurrency()
+        # Shared by every processor using the model, so the completion bound is global.
+        self.openai_integration = get_openai_integration(model=gpt_model)
+        # Completions keyed by a digest of their input, shared by identical files within
+        # and across pull requests for an hour.
+        self._completion_tasks = TTLCache(maxsize=2048, ttl=3600)
 
     # TODO: add an attribute that tries to compress the files code down instead of summary then summarize all code
     # Also try to use compressed code and structure for an architectural review as and possibly flow diagram
 
-    def generate_pr_summary(
+    async def generate_pr_summary(
         self, pr_number: int, process_diffs_only: bool = False
-    ) -> dict:
+    ) -> PRSummary:
         """
         Generates a summary for a specified pull request.
 
@@ -41,14 +200,13 @@ class PRProcessor:
             process_diffs_only (bool, optional): Whether to process diffs only. Defaults to False.
 
         Returns:
-            Dict: A dictionary containing the PR number and its summary.
+            PRSummary: The PR number and its summary.
         """
-        pr_summaries = self._generate_pr_summary(pr_number, process_diffs_only)
-        summary_content = pr_summaries[0]["Summary"]
-        self.gh_client.post_comment_on_pr(pr_number, summary_content)
-        return {"PR #": pr_number, "Summary": summary_content}
+        return await self._summarize_and_post(pr_number, process_diffs_only)
 
-    def generate_all_prs_summary(self, process_diffs_only: bool = False) -> list[dict]:
+    async def generate_all_prs_summary(
+        self, process_diffs_only: bool = False
+    ) -> list[PRSummary]:
         """
         Generates summaries for all open pull requests.
 
@@ -56,51 +214,128 @@ class PRProcessor:
             process_diffs_only (bool, optional): Whether to process diffs only. Defaults to False.
 
         Returns:
-            List[Dict]: A list of dictionaries, each containing a PR number and its summary.
+            list[PRSummary]: The summary of each open pull request.
         """
-        open_prs = self.gh_client.fetch_open_pull_requests()
+        open_prs = await self.gh_client.fetch_open_pull_requests()
+        results = await self._gather_bounded(
+            self._summarize_and_post(pr["number"], process_diffs_only)
+            for pr in open_prs
+        )
         all_summaries = []
-        for pr in open_prs:
-            summaries = self._generate_pr_summary(pr.number, process_diffs_only)
-            all_summaries.extend(summaries)
-            for summary in summaries:
-                self.gh_client.post_comment_on_pr(pr.number, summary["Summary"])
+        for pr, result in zip(open_prs, results):
+            if isinstance(result, Exception):
+                logger.error("Failed to summarize PR #%d: %s", pr["number"], result)
+                continue
+            all_summaries.append(result)
         return all_summaries
 
-    def _generate_pr_summary(
+    async def _summarize_and_post(
         self, pr_number: int, process_diffs_only: bool
-    ) -> list[dict]:
+    ) -> PRSummary:
+        """
+        Summarizes a single pull request and posts the summary as a comment on it.
+        """
+        pr_summary = await self._generate_pr_summary(pr_number, process_diffs_only)
+        await self.gh_client.post_comment_on_pr(pr_number, pr_summary.summary)
+        return pr_summary
+
+    async def _gather_bounded(self, coroutines) -> list:
+        """
+        Runs coroutines concurrently, never more than ``max_concurrency`` at a time.
+
+        Args:
+            coroutines: An iterable of coroutines to await.
+
+        Returns:
+            list: The results in input order; failures are returned as exceptions.
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def _bounded(coroutine):
+            async with semaphore:
+                return await coroutine
+
+        return await asyncio.gather(
+            *(_bounded(coroutine) for coroutine in coroutines), return_exceptions=True
+        )
+
+    async def _map_pr_files(self, pr_number: int, process_diffs_only: bool, func) -> list:
+        """
+        Runs a coroutine function over the reviewable files of a pull request.
+
+        Work on each file starts as soon as GitHub delivers it, overlapping the OpenAI
+        calls with the fetching of the remaining files.
+
+        Args:
+            pr_number: The number of the pull request.
+            process_diffs_only: Whether only diffs are reviewed; files without the relevant
+                text are skipped.
+            func: Called with each file, returning the coroutine to run for it.
+
+        Returns:
+            list: ``(file, result)`` pairs in the order the files arrived.
+        """
+        files = []
+        tasks = []
+        try:
+            async for file in self.gh_client.iter_files_from_pr(
+                pr_number, need_full_content=not process_diffs_only
+            ):
+                if not (file["patch"] if process_diffs_only else file["content"]):
+                    continue
+                files.append(file)
+                tasks.append(asyncio.create_task(func(file)))
+            results = await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+        return list(zip(files, results))
+
+    async def _generate_pr_summary(
+        self, pr_number: int, process_diffs_only: bool
+    ) -> PRSummary:
         """
         Helper method to fetch files from a PR, summarize and optionally compress them.
+
+        Small files are set aside while the others are summarized as they arrive, then
+        summarized together in as few completions as fit ``SUMMARY_BATCH_CHARS``.
         """
-        files = self.gh_client.fetch_files_from_pr(pr_number)
-        filtered_files = [
-            file
-            for file in files
-            if (
-                (process_diffs_only and file.get("patch"))
-                or (not process_diffs_only and file.get("content"))
-            )
-        ]
-        file_summaries = [
-            f"Filename: {file['filename']}\n{self._summarize_file(file, process_diffs_only, True)}"
-            for file in filtered_files
-        ]
-        combined_file_summaries = "\nNext PR File\n".join(file_summaries)
-        pr_summary_content = self._create_comprehensive_summary(
+        small_files = []
+
+        async def _summarize(file):
+            text = file["patch"] if process_diffs_only else file["content"]
+            if len(text) * 4 <= SUMMARY_BATCH_CHARS and not (
+                process_diffs_only
+                and is_trivial_change(
+                    text, file.get("language", "Plain text"), file["filename"]
+                )
+            ):
+                small_files.append(file)
+                return None
+            return await self._summarize_file(file, process_diffs_only, True)
+
+        results = await self._map_pr_files(pr_number, process_diffs_only, _summarize)
+        batched = await self._summarize_small_files(small_files, process_diffs_only)
+        combined_file_summaries = "\nNext PR File\n".join(
+            f"Filename: {file['filename']}\n"
+            f"{batched[file['filename']] if summary is None else summary}"
+            for file, summary in results
+        )
+        pr_summary_content = await self._create_comprehensive_summary(
             combined_file_summaries, process_diffs_only
         )
-        return [{"PR #": pr_number, "Summary": pr_summary_content}]
+        return PRSummary(pr_number, pr_summary_content)
 
-    def _summarize_file(
+    async def _summarize_file(
         self, file, process_diffs_only: bool, pr_summary: bool = False
     ) -> str:
         """
-        Asynchronously summarizes a file's content, optionally applying code minimization
+        Summarizes a file's content, optionally applying code minimization
         to enhance the efficiency of the summary produced by GPT.
 
         Args:
-            file: The file object containing details like 'patch', 'content', and 'file_type'.
+            file: The file object containing details like 'patch', 'content', and 'language'.
             process_diffs_only (bool): Flag indicating whether to summarize diff content only.
             pr_summary (bool): Flag indicating whether the summary is part of a larger PR summary,
                                which might necessitate a more condensed format.
@@ -111,50 +346,226 @@ class PRProcessor:
         text_to_summarize = (
             file.get("patch", "") if process_diffs_only else file["content"]
         )
-        diff_indicator = (
-            "This is a diff so treat '+' as additions and '-' as subtractions."
-            if process_diffs_only
-            else "This is a full file, not a diff."
+        language = file.get("language", "Plain text")
+        if process_diffs_only and is_trivial_change(
+            text_to_summarize, language, file["filename"]
+        ):
+            return text_to_summarize.strip() or "(no textual change)"
+        prompt = self._summary_prompt(process_diffs_only, pr_summary)
+
+        async def _summarize():
+            text = text_to_summarize
+            if pr_summary:
+                text = await minify_for_summary(text, language, process_diffs_only)
+            return await self._summarize_chunked(text, prompt)
+
+        return await self._deduplicated(
+            ("summary", language, prompt),
+            text_to_summarize,
+            _summarize,
+            digest=None if process_diffs_only else file.get("sha"),
         )
 
-        if pr_summary:
-            prompt = (
-                f"Summarize this file from a PR in the most condensed format that GPT can understand, "
-                f"combining it into a readable format for all files in a GitHub pull request. "
-                f"{diff_indicator} Use shorthand or minimize to use the least amount of tokens if necessary."
+    @staticmethod
+    def _summary_prompt(process_diffs_only: bool, pr_summary: bool) -> str:
+        """
+        Returns the instructions for summarizing a file.
+        """
+        return _SUMMARY_PROMPTS[process_diffs_only, pr_summary]
+
+    async def _summarize_small_files(self, files: list, process_diffs_only: bool) -> dict:
+        """
+        Summarizes small files of a PR several to a completion, saving the round trip and
+        prompt of one request per file. Files left alone in a group, or left out of a
+        grouped answer, are summarized on their own.
+
+        Args:
+            files: The files to summarize.
+            process_diffs_only: Whether the diffs are summarized rather than the content.
+
+        Returns:
+            dict: The summaries keyed by filename.
+        """
+        texts = await asyncio.gather(
+            *(
+                minify_for_summary(
+                    file["patch"] if process_diffs_only else file["content"],
+                    file.get("language", "Plain text"),
+                    process_diffs_only,
+                )
+                for file in files
             )
-            parser = get_parser_for_language(file.get("file_type", "Plain text"))
-            text_to_summarize = self._minimize_content(parser, text_to_summarize)
-        else:
-            prompt = f"Summarize this file from a PR. {diff_indicator}"
+        )
+        groups, group, size = [], {}, 0
+        for file, text in zip(files, texts):
+            if group and size + len(text) > SUMMARY_BATCH_CHARS:
+                groups.append(group)
+                group, size = {}, 0
+            group[file["filename"]] = text
+            size += len(text)
+        if group:
+            groups.append(group)
 
-        summary_response = self.openai_integration.summarize_text(
-            text_to_summarize, prompt
+        prompt = (
+            f"{self._summary_prompt(process_diffs_only, True)} "
+            f"Summarize each of the following files separately."
         )
+        summaries = {}
+        for grouped in await asyncio.gather(
+            *(
+                self._summarize_group(group, prompt)
+                for group in groups
+                if len(group) > 1
+            )
+        ):
+            summaries.update(grouped)
+
+        remaining = [file for file in files if file["filename"] not in summaries]
+        for file, summary in zip(
+            remaining,
+            await asyncio.gather(
+                *(self._summarize_file(file, process_diffs_only, True) for file in remaining)
+            ),
+        ):
+            summaries[file["filename"]] = summary
+        return summaries
+
+    async def _summarize_group(self, texts: dict, prompt: str) -> dict:
+        """
+        Summarizes a group of files in one completion, returning no summaries if the
+        answer cannot be used.
+        """
+        try:
+            return await self.openai_integration.summarize_files(texts, prompt)
+        except (ValueError, RetryError) as e:
+            logger.warning("Falling back to per-file summaries: %s", e)
+            return {}
 
-        return summary_response["choices"][0]["text"]
+    async def _summarize_chunked(self, text: str, prompt: str) -> str:
+        """
+        Summarizes a text, splitting it into overlapping chunks when it is too long to
+        summarize in one request. The chunks are summarized concurrently and their
+        summaries combined into one.
 
-    def review_pull_request(self, pr_number: int, process_diffs_only: bool = False):
+        Args:
+            text (str): The text to summarize.
+            prompt (str): The instructions for the summary.
+
+        Returns:
+            str: The summary.
+        """
+        chunks = chunk_by_tokens(
+            text,
+            SUMMARY_CHUNK_TOKENS,
+            self.openai_integration.model,
+            overlap=SUMMARY_CHUNK_OVERLAP_TOKENS,
+        )
+        if len(chunks) == 1:
+            response = await self.openai_integration.summarize_text(text, prompt)
+            return response["choices"][0]["text"]
+
+        responses = await asyncio.gather(
+            *(
+                self.openai_integration.summarize_text(
+                    chunk, f"{prompt} This is part {index} of {len(chunks)} of the file."
+                )
+                for index, chunk in enumerate(chunks, 1)
+            )
+        )
+        partial_summaries = "\n\n".join(
+            f"Part {index}:\n{response['choices'][0]['text']}"
+            for index, response in enumerate(responses, 1)
+        )
+        response = await self.openai_integration.summarize_text(
+            partial_summaries,
+            f"Combine these summaries of consecutive parts of one file into a single "
+            f"summary. {prompt}",
+        )
+        return response["choices"][0]["text"]
+
+    async def _deduplicated(
+        self, key_parts: tuple, text: str, coroutine_function, digest: str = None
+    ):
+        """
+        Runs a completion once for every distinct input, sharing the result between
+        identical files (vendored code, generated files, boilerplate fixtures) within
+        and across pull requests.
+
+        Args:
+            key_parts (tuple): Everything besides the text that the result depends on.
+            text (str): The file text sent to OpenAI.
+            coroutine_function: Called without arguments to produce the completion.
+            digest (str, optional): A digest already identifying the text, such as the
+                file's blob sha, used instead of hashing the text.
+
+        Returns:
+            The result of the shared completion.
+        """
+        if digest is None:
+            digest = hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+        key = (key_parts, digest)
+        task = self._completion_tasks.get(key)
+        if task is None or (
+            task.done() and (task.cancelled() or task.exception() is not None)
+        ):
+            task = asyncio.ensure_future(coroutine_function())
+            self._completion_tasks[key] = task
+        # Shielded so that one cancelled caller does not cancel the others.
+        return await asyncio.shield(task)
+
+    async def review_pull_request(self, pr_number: int, process_diffs_only: bool = False):
         """
         Processes a single pull request by summarizing and reviewing each file within it.
 
         This method fetches all files from the specified pull request, generates summaries,
-        conducts code reviews, and posts the combined findings as a comment on the pull request.
+        conducts code reviews, and posts the findings for all files as a single review on
+        the pull request.
 
         Args:
             pr_number: The number of the pull request to process.
             process_diffs_only: Indicates whether to consider only the diffs of the files for processing.
         """
-        files = self.gh_client.fetch_files_from_pr(pr_number)
-        for file in files:
-            self.process_file(file, pr_number, process_diffs_only)
+        results = await self._map_pr_files(
+            pr_number,
+            process_diffs_only,
+            lambda file: self._review_file(file, process_diffs_only),
+        )
+        await self._post_review(pr_number, results)
 
-    def review_all_open_pull_requests(self, process_diffs_only: bool = False) -> str:
+    async def _post_review(self, pr_number: int, results) -> None:
+        """
+        Posts formatted file comments as one pull request review.
+
+        Args:
+            pr_number: The number of the pull request.
+            results: ``(file, comment)`` pairs.
+        """
+        comments = [
+            {
+                "path": file["filename"],
+                "body": comment,
+                "has_diff": bool(file.get("patch")),
+            }
+            for file, comment in results
+            if comment is not None
+        ]
+        if not comments:
+            return
+        await self.gh_client.post_review(
+            pr_number,
+            comments,
+            body=(
+                f"Automated review of {len(comments)} file(s) "
+                f"with {self.openai_integration.model}."
+            ),
+        )
+
+    async def review_all_open_pull_requests(self, process_diffs_only: bool = False) -> str:
         """
         Processes all open pull requests in the repository by summarizing and reviewing each file within them.
 
-        Iterates through each open pull request, applying the process_pull_request method to each,
-        thereby generating summaries and reviews for posting on GitHub.
+        Open pull requests are reviewed concurrently, bounded by ``max_concurrency``, thereby
+        generating summaries and reviews for posting on GitHub.
 
         Args:
             process_diffs_only: Indicates whether to consider only the diffs of the files for processing.
@@ -162,41 +573,172 @@ class PRProcessor:
         Returns:
             A simple confirmation message indicating the completion of the operation.
         """
-        open_prs = self.gh_client.fetch_open_pull_requests()
-        for pr in open_prs:
-            self.review_pull_request(pr.number, process_diffs_only)
+        open_prs = await self.gh_client.fetch_open_pull_requests()
+        results = await self._gather_bounded(
+            self.review_pull_request(pr["number"], process_diffs_only)
+            for pr in open_prs
+        )
+        for pr, result in zip(open_prs, results):
+            if isinstance(result, Exception):
+                logger.error("Failed to review PR #%d: %s", pr["number"], result)
         return "OK"
 
-    def process_file(self, file, pr_number, process_diffs_only: bool = False):
+    async def submit_review_batch(self, process_diffs_only: bool = False):
+        """
+        Submits summaries and reviews for every file of every open pull request
+        as a single OpenAI batch job.
+
+        Args:
+            process_diffs_only: Indicates whether to consider only the diffs of the files for processing.
+
+        Returns:
+            A tuple of the batch id and a mapping of request ids to the PR number and file
+            they belong to, to be handed to :meth:`post_batch_reviews`. The batch id is
+            None when there is nothing to review, in which case no batch is submitted.
+        """
+        open_prs = await self.gh_client.fetch_open_pull_requests()
+        requests = {}
+        targets = {}
+        results = await self._gather_bounded(
+            self._add_batch_requests(pr["number"], process_diffs_only, requests, targets)
+            for pr in open_prs
+        )
+        for pr, result in zip(open_prs, results):
+            if isinstance(result, Exception):
+                logger.error("Failed to fetch files for PR #%d: %s", pr["number"], result)
+
+        if not requests:
+            logger.info("No reviewable files in open PRs, no batch submitted")
+            return None, {}
+        batch_id = await self.openai_integration.create_batch(requests)
+        return batch_id, targets
+
+    async def _add_batch_requests(
+        self, pr_number: int, process_diffs_only: bool, requests: dict, targets: dict
+    ) -> None:
+        """
+        Adds the summary and review requests for the files of a pull request to a batch,
+        building each file's messages as GitHub delivers it.
+
+        Only what is needed to post the results is kept of each file, so full contents
+        are released as soon as their messages are built.
+
+        Args:
+            pr_number: The number of the pull request.
+            process_diffs_only: Indicates whether to consider only the diffs of the files.
+            requests: Mapping of request ids to request parameters, added to.
+            targets: Mapping of request ids to the PR number and file, added to.
         """
-        Processes a single file from a pull request by generating a summary and a code review,
-        then formats and posts the combined content as a comment on the pull request.
+        summary_prompt = self._summary_prompt(process_diffs_only, False)
+        index = 0
+        async for file in self.gh_client.iter_files_from_pr(
+            pr_number, need_full_content=not process_diffs_only
+        ):
+            code = file["patch"] if process_diffs_only else file["content"]
+            language = file.get("language", "Plain text")
+            if not code or not is_reviewable(language):
+                continue
+            request_id = f"{pr_number}-{index}"
+            index += 1
+            requests[f"{request_id}-summary"] = {
+                "messages": self.openai_integration.build_summary_messages(
+                    code, summary_prompt
+                )
+            }
+            requests[f"{request_id}-review"] = (
+                self.openai_integration.build_review_request(
+                    code, language, process_diffs_only
+                )
+            )
+            targets[request_id] = (
+                pr_number,
+                {"filename": file["filename"], "language": language, "patch": file["patch"]},
+            )
+
+    async def post_batch_reviews(
+        self, batch_id: str, targets: dict, process_diffs_only: bool = False
+    ) -> None:
+        """
+        Waits for a batch submitted by :meth:`submit_review_batch` and posts the
+        resulting summaries and reviews as one review per pull request.
+
+        Args:
+            batch_id: The id of the submitted batch.
+            targets: Mapping of request ids to the PR number and file they belong to.
+            process_diffs_only: Indicates whether the batch was built from diffs only.
+        """
+        results = await self.openai_integration.wait_for_batch(batch_id)
+        comments_by_pr = {}
+        for request_id, (pr_number, file) in targets.items():
+            summary = results.get(f"{request_id}-summary")
+            review = results.get(f"{request_id}-review")
+            if summary is None or review is None:
+                logger.error("Batch %s has no result for %s", batch_id, request_id)
+                continue
+            comment = self._format_comment(
+                file["filename"],
+                file.get("language", "Plain text"),
+                summary,
+                review,
+                process_diffs_only,
+            )
+            comments_by_pr.setdefault(pr_number, []).append((file, comment))
+        posted = await self._gather_bounded(
+            self._post_review(pr_number, comments)
+            for pr_number, comments in comments_by_pr.items()
+        )
+        for pr_number, result in zip(comments_by_pr, posted):
+            if isinstance(result, Exception):
+                logger.error("Failed to post batch review on PR #%d: %s", pr_number, result)
+
+    async def process_file(self, file, pr_number, process_diffs_only: bool = False):
+        """
+        Processes a single file from a pull request by generating a summary and a code review
+        in one completion, then formats and posts the combined content as a comment on the
+        pull request.
 
         Args:
             file: The file object containing details and content for processing.
             pr_number: The pull request number to which the file belongs.
             process_diffs_only: Indicates whether to consider only the diffs of the file for processing.
         """
-        if (process_diffs_only and not file["patch"]) or not file["content"]:
-            return
+        comment_to_post = await self._review_file(file, process_diffs_only)
+        if comment_to_post is not None:
+            await self.gh_client.post_comment_on_pr(pr_number, comment_to_post)
 
-        summary_content = self._summarize_file(file, process_diffs_only)
-        review_content = self._review_code(file, process_diffs_only)
-        comment_to_post = self._format_comment(
-            file, summary_content, review_content, process_diffs_only
-        )
-        self.gh_client.post_comment_on_pr(pr_number, comment_to_post)
-
-    def _minimize_content(self, parser, content: str) -> str:
+    async def _review_file(self, file, process_diffs_only: bool) -> str | None:
         """
-        Attempts to minimize the given content using the specified parser.
+        Generates the formatted summary and review comment for a single file.
+
+        Args:
+            file: The file object containing details and content for processing.
+            process_diffs_only: Indicates whether to consider only the diffs of the file for processing.
+
+        Returns:
+            str | None: The comment, or None if the file has nothing to review.
         """
-        try:
-            return parser.minify_code(content)
-        except NotImplementedError:
-            return content
+        code = file["patch"] if process_diffs_only else file["content"]
+        language = file.get("language", "Plain text")
+        if (
+            not code
+            or not is_reviewable(language)
+            or (process_diffs_only and is_trivial_change(code, language, file["filename"]))
+        ):
+            return None
+
+        result = await self._deduplicated(
+            ("review", language, process_diffs_only),
+            code,
+            lambda: self.openai_integration.summarize_and_review(
+                code, language=language, is_diff=process_diffs_only
+            ),
+            digest=None if process_diffs_only else file.get("sha"),
+        )
+        return self._format_comment(
+            file["filename"], language, result["summary"], result["review"], process_diffs_only
+        )
 
-    def _create_comprehensive_summary(
+    async def _create_comprehensive_summary(
         self, combined_file_summaries: str, process_diffs_only: bool
     ) -> str:
         """
@@ -206,32 +748,22 @@ class PRProcessor:
             "Create a comprehensive summary based on individual file summaries from this PR. "
             "Summarize the overall impact of the PR, highlighting key additions, deletions, and modifications."
         )
-        summary_response = self.openai_integration.summarize_text(
+        summary_response = await self.openai_integration.summarize_text(
             combined_file_summaries, prompt
         )
         return summary_response["choices"][0]["text"]
 
-    def _review_code(self, file, process_diffs_only: bool) -> str:
-        """
-        Reviews the code of a file.
-        """
-        code_to_review = (
-            file.get("patch", "") if process_diffs_only else file["content"]
-        )
-        language = file.get("file_type", "Plain text")
-        review_response = self.openai_integration.review_code(
-            code_to_review, language=language, is_diff=process_diffs_only
-        )
-        return review_response["choices"][0]["text"]
-
     def _format_comment(
-        self, file, summary_content: str, review: str, process_diffs_only: bool
+        self,
+        filename: str,
+        language: str,
+        summary_content: str,
+        review: str,
+        process_diffs_only: bool,
     ) -> str:
         """
         Formats the final comment to be posted on GitHub, including both summary and review.
         """
-        filename = file["filename"]
-        language = file.get("file_type", "Plain text")
         return (
             f"Filename: {filename}\nModel: {self.openai_integration.model}\nLanguage: {language}\n"
             f"Summary:\n{summary_content}\n\nCode Review (diff={process_diffs_only}):\n{review}"
@@ -2,9 +2,23 @@
 
 from __future__ import annotations
 
-import os
+from functools import lru_cache
+from types import MappingProxyType
 
 
+# Extensions that determine the file type on their own, anywhere under force-app.
+_SF_EXTENSION_LANGUAGES = {
+    ".xml": "Salesforce Metadata XML",
+    ".page": "Salesforce Visualforce",
+    ".component": "Salesforce Visualforce",
+    ".cls": "Salesforce Apex",
+    ".trigger": "Salesforce Apex",
+}
+_AURA_EXTENSIONS = frozenset((".cmp", ".app", ".evt", ".intf"))
+_LWC_EXTENSIONS = frozenset((".js", ".html"))
+
+
+@lru_cache(maxsize=8192)
 def detect_salesforce_language(filepath: str) -> str | None:
     """
     Detects the Salesforce-specific programming language or file type for a given file
@@ -17,33 +31,25 @@ def detect_salesforce_language(filepath: str) -> str | None:
         str | None: Detected Salesforce programming language or file type,
                     or None if not a Salesforce file.
     """
-    directory = os.path.dirname(filepath)
-    filename = os.path.basename(filepath)
-    directory_parts = directory.split("/")  # github uses /
+    directory, _, filename = filepath.rpartition("/")  # github uses /
+    # Wrapping the directory in separators lets whole components be matched by substring.
+    directory = f"/{directory}/"
     # Ensure we are within a Salesforce project
-    file_type = None
-    if "force-app" in directory_parts:
-        file_type = "Salesforce Other"
-        if "__tests__" in directory_parts and filename.endswith(".js"):
-            file_type = "Salesforce LWC Jest Test"
-        if "lwc" in directory_parts and (
-            filename.endswith(".js") or filename.endswith(".html")
-        ):
-            file_type = "Salesforce LWC"
-        if filename.endswith(".cls") or filename.endswith(".trigger"):
-            file_type = "Salesforce Apex"
-        if "aura" in directory_parts and (
-            filename.endswith(".cmp")
-            or filename.endswith(".app")
-            or filename.endswith(".evt")
-            or filename.endswith(".intf")
-        ):
-            file_type = "Salesforce Aura Component"
-        if filename.endswith(".page") or filename.endswith(".component"):
-            file_type = "Salesforce Visualforce"
-        if filename.endswith(".xml"):
-            file_type = "Salesforce Metadata XML"
-    return file_type
+    if "/force-app/" not in directory:
+        return None
+
+    dot = filename.rfind(".")
+    extension = filename[dot:] if dot != -1 else ""
+    file_type = _SF_EXTENSION_LANGUAGES.get(extension)
+    if file_type:
+        return file_type
+    if extension in _AURA_EXTENSIONS and "/aura/" in directory:
+        return "Salesforce Aura Component"
+    if extension in _LWC_EXTENSIONS and "/lwc/" in directory:
+        return "Salesforce LWC"
+    if extension == ".js" and "/__tests__/" in directory:
+        return "Salesforce LWC Jest Test"
+    return "Salesforce Other"
 
 
 LWC_CODE_PROMPT = """Review the provided Salesforce LWC code for adherence to coding standards. Focus on:
@@ -110,13 +116,20 @@ APEX_TEST_PROMPT = """Review Salesforce Apex test code for standards adherence.
 Provide snippets highlighting violations with the existing code and suggest corrections for each aspect.
 """
 
-SF_LANGUAGE_TO_PROMPT = {
-    "Salesforce LWC": LWC_CODE_PROMPT,
-    "Salesforce LWC Jest Test": LWC_TEST_CODE_PROMPT,
-    "Salesforce Apex": APEX_CODE_PROMPT,
-    "Salesforce Apex Test": APEX_TEST_PROMPT,
-    "Salesforce Aura Component": "",
-    "Salesforce Visualforce": "",
-    "Salesforce Metadata XML": "",
-    "Salesforce Other": "",
-}
+# Read-only; prompts are stripped once here rather than sending the surrounding
+# whitespace with every request.
+SF_LANGUAGE_TO_PROMPT = MappingProxyType(
+    {
+        language: prompt.strip()
+        for language, prompt in {
+            "Salesforce LWC": LWC_CODE_PROMPT,
+            "Salesforce LWC Jest Test": LWC_TEST_CODE_PROMPT,
+            "Salesforce Apex": APEX_CODE_PROMPT,
+            "Salesforce Apex Test": APEX_TEST_PROMPT,
+            "Salesforce Aura Component": "",
+            "Salesforce Visualforce": "",
+            "Salesforce Metadata XML": "",
+            "Salesforce Other": "",
+        }.items()
+    }
+)
@@ -8,35 +8,70 @@ from __future__ import annotations
 
 import logging
 
+from fastapi import BackgroundTasks
+
 from app.models.github_webhook_schema import GitHubWebhookPayload
 from app.services.pr_processing import PRProcessor
 
 logger = logging.getLogger(__name__)
 
+# Pull request actions that change the code under review; others (closed, labeled,
+# assigned...) are acknowledged without a review.
+REVIEWED_PR_ACTIONS = frozenset(("opened", "reopened", "synchronize", "ready_for_review"))
+
+
+def is_reviewed_event(event: str | None) -> bool:
+    """
+    Tells whether a webhook event type can trigger a review, from the ``X-GitHub-Event``
+    header, so other events are dismissed before their body is even decoded.
+
+    Args:
+        event (str | None): The event type, or None if the header is missing.
+    """
+    return event is None or event == "pull_request"
+
 
-async def handle_github_webhook(payload: GitHubWebhookPayload):
+def is_reviewed_action(payload: GitHubWebhookPayload) -> bool:
+    """
+    Tells whether a pull request event changes the code under review.
+
+    Args:
+        payload (GitHubWebhookPayload): The decoded webhook payload; payloads without an
+            action, such as manual calls, are always reviewed.
+    """
+    return payload.action is None or payload.action in REVIEWED_PR_ACTIONS
+
+
+async def handle_github_webhook(
+    payload: GitHubWebhookPayload,
+    processor: PRProcessor,
+    background_tasks: BackgroundTasks,
+):
     """
     Processes a GitHub webhook payload related to pull requests.
 
-    This function extracts necessary information from the webhook payload to initiate
-    a review process on the pull request using the PRProcessor class.
+    This function extracts the pull request from the webhook payload and queues its review
+    with the given PRProcessor, so that GitHub gets its acknowledgement right away instead
+    of timing out and redelivering the event while the review runs.
 
     Args:
         payload (GitHubWebhookPayload): The payload data received from a GitHub webhook event.
+        processor (PRProcessor): The shared processor for the payload's repository and sender.
+        background_tasks (BackgroundTasks): Runs the review once the response has been sent.
 
     Returns:
-        dict: A dictionary message indicating the pull request processing status.
+        dict: A dictionary message indicating the pull request was queued for review.
     """
-    pr_number = payload.pull_request.get("number")
-    repository_full_name = payload.repository.get("full_name", "")
-    user_login = payload.sender.get("login", "")
-
-    processor = PRProcessor(
-        user_login=user_login,
-        repo_full_name=repository_full_name,
-        gpt_model="your-gpt-model",  # Ensure you replace "your-gpt-model" with an actual model identifier if needed.
+    pr_number = payload.pull_request.number
+    logger.info(
+        "Queueing review of PR #%d of %s for %s",
+        pr_number,
+        payload.repository.full_name,
+        payload.sender.login,
     )
 
-    await processor.review_pull_request(pr_number, process_diffs_only=False)
+    background_tasks.add_task(
+        processor.review_pull_request, pr_number, process_diffs_only=False
+    )
 
-    return {"message": "Pull request processed successfully"}
+    return {"message": "Pull request queued for review"}
@@ -0,0 +1,136 @@
+"""Module providing an on-disk cache of Git blob contents keyed by their sha."""
+
+from __future__ import annotations
+
+import logging
+import os
+import tempfile
+import threading
+from functools import lru_cache
+
+from app.config_loader import get_config
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BLOB_CACHE_DIR = "~/.cache/codereviewbot/blobs"
+DEFAULT_BLOB_CACHE_MAX_MB = 512
+
+
+class BlobCache:
+    """
+    Stores blob contents under ``<directory>/<sha[:2]>/<sha>``.
+
+    Blobs are content-addressed, so an entry never goes stale; the cache only has to
+    stay within its size bound, which it does by evicting the least recently read
+    entries (by access time) once the bound is exceeded.
+    """
+
+    def __init__(self, directory: str, max_bytes: int):
+        """
+        Initializes the cache.
+
+        Args:
+            directory (str): Directory holding the cached blobs; created on demand.
+            max_bytes (int): The size the cache is trimmed back under when exceeded.
+        """
+        self.directory = os.path.expanduser(directory)
+        self.max_bytes = max_bytes
+        self._size = None
+        self._lock = threading.Lock()
+
+    def _path(self, sha: str) -> str:
+        return os.path.join(self.directory, sha[:2], sha)
+
+    def get(self, sha: str) -> bytes | None:
+        """
+        Reads a cached blob.
+
+        Args:
+            sha (str): The blob sha.
+
+        Returns:
+            bytes | None: The blob contents, or None on a miss.
+        """
+        path = self._path(sha)
+        try:
+            with open(path, "rb") as file:
+                data = file.read()
+            # Refresh the access time even on noatime mounts, it drives eviction.
+            os.utime(path)
+        except OSError:
+            # Missing, or evicted by another worker in the meantime.
+            return None
+        return data
+
+    def put(self, sha: str, data: bytes) -> None:
+        """
+        Stores a blob atomically, evicting old entries if the cache grows too large.
+
+        Args:
+            sha (str): The blob sha.
+            data (bytes): The blob contents.
+        """
+        path = self._path(sha)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as file:
+                file.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+        with self._lock:
+            if self._size is None:
+                self._size = sum(size for _, size, _ in self._entries())
+            else:
+                self._size += len(data)
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def _entries(self):
+        for root, _dirs, names in os.walk(self.directory):
+            for name in names:
+                if name.startswith(".tmp-"):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                yield path, stat.st_size, stat.st_atime
+
+    def _evict(self) -> None:
+        """Deletes the least recently read blobs until the cache is back under 80% of its bound."""
+        entries = sorted(self._entries(), key=lambda entry: entry[2])
+        self._size = sum(size for _, size, _ in entries)
+        target = self.max_bytes * 0.8
+        for path, size, _ in entries:
+            if self._size <= target:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            self._size -= size
+        logger.info("Trimmed blob cache to %d bytes", self._size)
+
+
+@lru_cache(maxsize=1)
+def get_blob_cache() -> BlobCache | None:
+    """
+    Returns the process-wide blob cache configured under ``cache`` in the configuration.
+
+    Returns:
+        BlobCache | None: The cache, or None when ``cache.blob_dir`` is set to null.
+    """
+    cache_config = get_config().get("cache", {})
+    directory = os.environ.get(
+        "CODEREVIEWBOT_BLOB_CACHE_DIR",
+        cache_config.get("blob_dir", DEFAULT_BLOB_CACHE_DIR),
+    )
+    if not directory:
+        return None
+    max_mb = cache_config.get("blob_max_mb", DEFAULT_BLOB_CACHE_MAX_MB)
+    return BlobCache(directory, max_mb * 1024 * 1024)
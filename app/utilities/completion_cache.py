@@ -0,0 +1,128 @@
+"""Module providing an on-disk cache of OpenAI completions keyed by a digest of their request."""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from functools import lru_cache
+
+import orjson
+
+from app.config_loader import get_config
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_COMPLETION_CACHE_PATH = "~/.cache/codereviewbot/completions.sqlite3"
+DEFAULT_COMPLETION_CACHE_TTL_DAYS = 7
+
+
+def completion_key(model: str, messages: list, **kwargs) -> str:
+    """
+    Returns the digest identifying a completion request.
+
+    Args:
+        model (str): The model the request is sent to.
+        messages (list): The chat messages.
+        **kwargs: Any other request parameters the completion depends on.
+    """
+    request = orjson.dumps(
+        {"model": model, "messages": messages, **kwargs}, option=orjson.OPT_SORT_KEYS
+    )
+    return hashlib.sha256(request).hexdigest()
+
+
+class CompletionCache:
+    """
+    Stores parsed completions in a SQLite database so that unchanged files are not sent to
+    OpenAI again on later runs, such as a re-review after a force-push. Entries expire
+    after ``ttl`` seconds.
+    """
+
+    def __init__(self, path: str, ttl: float):
+        """
+        Initializes the cache; the database is opened on first use.
+
+        Args:
+            path (str): The SQLite database file; its directory is created on demand.
+            ttl (float): How long an entry is served, in seconds.
+        """
+        self.path = os.path.expanduser(path)
+        self.ttl = ttl
+        self._connection = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            connection = sqlite3.connect(self.path, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS completions "
+                "(key TEXT PRIMARY KEY, created REAL NOT NULL, value BLOB NOT NULL)"
+            )
+            connection.execute(
+                "DELETE FROM completions WHERE created < ?", (time.time() - self.ttl,)
+            )
+            connection.commit()
+            self._connection = connection
+        return self._connection
+
+    def get(self, key: str) -> dict | None:
+        """
+        Reads a cached completion.
+
+        Args:
+            key (str): The request digest, see :func:`completion_key`.
+
+        Returns:
+            dict | None: The completion, or None on a miss or if the entry expired.
+        """
+        with self._lock:
+            row = (
+                self._connect()
+                .execute(
+                    "SELECT value FROM completions WHERE key = ? AND created >= ?",
+                    (key, time.time() - self.ttl),
+                )
+                .fetchone()
+            )
+        return None if row is None else orjson.loads(row[0])
+
+    def put(self, key: str, value: dict) -> None:
+        """
+        Stores a completion.
+
+        Args:
+            key (str): The request digest, see :func:`completion_key`.
+            value (dict): The parsed completion.
+        """
+        with self._lock:
+            connection = self._connect()
+            connection.execute(
+                "INSERT OR REPLACE INTO completions VALUES (?, ?, ?)",
+                (key, time.time(), orjson.dumps(value)),
+            )
+            connection.commit()
+
+
+@lru_cache(maxsize=1)
+def get_completion_cache() -> CompletionCache | None:
+    """
+    Returns the process-wide completion cache configured under ``cache`` in the configuration.
+
+    Returns:
+        CompletionCache | None: The cache, or None when ``cache.completion_db`` is set to null.
+    """
+    cache_config = get_config().get("cache", {})
+    path = os.environ.get(
+        "CODEREVIEWBOT_COMPLETION_CACHE",
+        cache_config.get("completion_db", DEFAULT_COMPLETION_CACHE_PATH),
+    )
+    if not path:
+        return None
+    ttl_days = cache_config.get("completion_ttl_days", DEFAULT_COMPLETION_CACHE_TTL_DAYS)
+    return CompletionCache(path, ttl_days * 86400)
@@ -2,22 +2,242 @@
 
 from __future__ import annotations
 
+import asyncio
+import functools
 import logging
-import os
-from base64 import b64decode
 
+import httpx
+import orjson
+from cachetools import LRUCache, TLRUCache
 from fastapi import HTTPException
-from github import Github, GithubException, UnknownObjectException
 from pygments.lexers import guess_lexer_for_filename
 from pygments.util import ClassNotFound
-from unidiff import PatchSet
+from tenacity import (retry, retry_if_exception, stop_after_attempt,
+                      wait_random_exponential)
 
-from app.config_loader import get_config
+from app.config_loader import get_config, get_github_api_keys
 from app.services.salesforce.salesforce_handler import \
     detect_salesforce_language
+from app.utilities.blob_cache import get_blob_cache
+from app.utilities.github_rate_limiter import get_rate_limiter
+from app.utilities.http_pool import get_http_transport
+from app.utilities.lexer_index import get_lexer_index
 
 logger = logging.getLogger(__name__)
 
+GITHUB_API_URL = "https://api.github.com"
+
+# Cached reads live this many times longer while the REST rate-limit budget is low.
+LOW_RATE_LIMIT_REMAINING = 500
+LOW_RATE_LIMIT_TTL_FACTOR = 5
+
+# Largest page size the REST list endpoints accept; the default is 30.
+PER_PAGE = 100
+
+
+# Shared HTTP clients keyed by (api_key, base_url).
+_HTTP_CLIENTS = {}
+
+# Bytes of GET responses kept for revalidation with If-None-Match, across the process.
+ETAG_CACHE_BYTES = 32 * 1024 * 1024
+
+# GET responses carrying an ETag, keyed by token, URL, query and media type; a 304 answer
+# to a conditional request reuses them and costs no rate limit. One cache is shared by
+# every integration so that the byte bound holds however many integrations are alive.
+_ETAG_CACHE = LRUCache(
+    maxsize=ETAG_CACHE_BYTES, getsizeof=lambda response: len(response.content) + 1
+)
+
+
+def get_http_client(api_key: str, base_url: str = GITHUB_API_URL) -> httpx.AsyncClient:
+    """
+    Returns the process-wide client for an API key. Clients for every key share the
+    HTTP/2 connection pool of :func:`get_http_transport`.
+
+    Args:
+        api_key (str): GitHub API token sent with every request.
+        base_url (str, optional): GitHub API root. Defaults to GitHub Cloud.
+
+    Returns:
+        httpx.AsyncClient: The shared client.
+    """
+    client = _HTTP_CLIENTS.get((api_key, base_url))
+    if client is None:
+        client = httpx.AsyncClient(
+            base_url=base_url,
+            headers={
+                "Accept": "application/vnd.github+json",
+                "Authorization": f"Bearer {api_key}",
+                "X-GitHub-Api-Version": "2022-11-28",
+            },
+            timeout=30.0,
+            transport=get_http_transport(),
+        )
+        _HTTP_CLIENTS[(api_key, base_url)] = client
+    return client
+
+
+async def close_http_clients():
+    """
+    Closes every shared GitHub HTTP client; called when the application shuts down.
+    """
+    while _HTTP_CLIENTS:
+        _, client = _HTTP_CLIENTS.popitem()
+        await client.aclose()
+
+
+def _cached_read(ttl: float):
+    """
+    Caches the result of a read-only GitHubIntegration coroutine for ``ttl`` seconds.
+
+    The wrapped method accepts a ``force_refresh`` keyword that bypasses and replaces
+    the cached value.
+    """
+
+    def decorator(method):
+        @functools.wraps(method)
+        async def wrapper(self, *args, force_refresh: bool = False):
+            key = (self.repo_full_name, method.__name__, args)
+            if force_refresh:
+                self._cache.pop(key, None)
+            else:
+                cached = self._cache.get(key)
+                if cached is not None:
+                    return cached[1]
+            value = await method(self, *args)
+            effective_ttl = ttl
+            if (
+                self.rate_limit_remaining is not None
+                and self.rate_limit_remaining < LOW_RATE_LIMIT_REMAINING
+            ):
+                effective_ttl *= LOW_RATE_LIMIT_TTL_FACTOR
+            self._cache[key] = (effective_ttl, value)
+            return value
+
+        return wrapper
+
+    return decorator
+
+
+# Language names for common extensions, matching the pygments lexer names so that the
+# lexer index and lexer guessing only run for the long tail.
+_EXTENSION_LANGUAGES = {
+    ".py": "Python",
+    ".pyi": "Python",
+    ".js": "JavaScript",
+    ".mjs": "JavaScript",
+    ".cjs": "JavaScript",
+    ".jsx": "JSX",
+    ".ts": "TypeScript",
+    ".java": "Java",
+    ".kt": "Kotlin",
+    ".kts": "Kotlin",
+    ".go": "Go",
+    ".rs": "Rust",
+    ".rb": "Ruby",
+    ".php": "PHP",
+    ".c": "C",
+    ".h": "C",
+    ".cpp": "C++",
+    ".cc": "C++",
+    ".hpp": "C++",
+    ".cs": "C#",
+    ".swift": "Swift",
+    ".scala": "Scala",
+    ".dart": "Dart",
+    ".lua": "Lua",
+    ".groovy": "Groovy",
+    ".gradle": "Groovy",
+    ".sh": "Bash",
+    ".bash": "Bash",
+    ".ps1": "PowerShell",
+    ".html": "HTML",
+    ".htm": "HTML",
+    ".css": "CSS",
+    ".scss": "SCSS",
+    ".json": "JSON",
+    ".yml": "YAML",
+    ".yaml": "YAML",
+    ".toml": "TOML",
+    ".ini": "INI",
+    ".md": "Markdown",
+    ".xml": "XML",
+    ".txt": "Text only",
+}
+
+
+# Extensions of binary files: they are left out of PR file listings, as there is nothing
+# to review or decode in them.
+_BINARY_EXTENSIONS = frozenset(
+    (
+        ".png", ".jpg", ".jpeg", ".gif", ".bmp", ".ico", ".webp", ".tif", ".tiff",
+        ".pdf", ".psd", ".mp3", ".mp4", ".mov", ".avi", ".wav", ".ogg", ".webm",
+        ".zip", ".gz", ".tgz", ".bz2", ".xz", ".7z", ".rar", ".tar", ".jar", ".war",
+        ".whl", ".egg", ".so", ".dll", ".dylib", ".exe", ".bin", ".o", ".a", ".lib",
+        ".class", ".pyc", ".pyo", ".woff", ".woff2", ".ttf", ".otf", ".eot",
+        ".sqlite", ".db", ".parquet", ".pkl", ".npy", ".npz",
+    )
+)
+
+
+def _extension(filepath: str) -> str:
+    """Returns the lowercased extension of a GitHub path, or an empty string."""
+    # GitHub paths always use "/"; a leading dot (".bashrc") does not start an extension.
+    filename = filepath.rpartition("/")[2]
+    stem, dot, suffix = filename.rpartition(".")
+    return f".{suffix.lower()}" if dot and stem else ""
+
+
+def is_binary_path(filepath: str) -> bool:
+    """
+    Tells whether a file is binary, judging by its extension alone.
+
+    Args:
+        filepath (str): Path or name of the file.
+    """
+    return _extension(filepath) in _BINARY_EXTENSIONS
+
+
+# Generated files: lockfiles, minified bundles and source maps are rebuilt by tools and
+# never worth a review, however large their diff.
+_GENERATED_FILENAMES = frozenset(
+    (
+        "package-lock.json", "npm-shrinkwrap.json", "pnpm-lock.yaml", "go.sum",
+        "packages.lock.json",
+    )
+)
+_GENERATED_SUFFIXES = (".lock", ".min.js", ".min.css", ".map")
+
+
+def is_skipped_path(filepath: str) -> bool:
+    """
+    Tells whether a PR file is left out of reviews and summaries: binary and generated
+    files are recognised from their name alone, before any other work is spent on them.
+
+    Args:
+        filepath (str): Path or name of the file.
+    """
+    if is_binary_path(filepath):
+        return True
+    filename = filepath.rpartition("/")[2].lower()
+    return filename in _GENERATED_FILENAMES or filename.endswith(_GENERATED_SUFFIXES)
+
+
+@functools.lru_cache(maxsize=2048)
+def _guess_language(filename: str) -> str:
+    """
+    Falls back to pygments' lexer guessing for filenames missing from the extension table
+    and the lexer index.
+
+    Args:
+        filename (str): ``file.<ext>`` for files with an extension, so every file sharing
+            an extension hits the same cache entry, or the basename for files without one.
+    """
+    try:
+        return guess_lexer_for_filename(filename, "").name
+    except ClassNotFound:
+        return "Unknown"
+
 
 def detect_language(filepath):
     """
@@ -30,17 +250,102 @@ def detect_language(filepath):
         str: Detected programming language, or 'Unknown' if detection fails.
     """
     logger.debug("Detecting language for: %s", filepath)
-    filename = os.path.basename(filepath)
-
+    extension = _extension(filepath)
+    if extension in _BINARY_EXTENSIONS:
+        return "Unknown"
     sf_language = detect_salesforce_language(filepath)
     if sf_language:
         return sf_language
 
-    try:
-        lexer = guess_lexer_for_filename(filename, "")
-        return lexer.name
-    except ClassNotFound:
-        return "Unknown"
+    language = _EXTENSION_LANGUAGES.get(extension) or get_lexer_index().get(extension)
+    return language or _guess_language(
+        f"file{extension}" if extension else filepath.rpartition("/")[2]
+    )
+
+
+def _is_rate_limited(exc: BaseException) -> bool:
+    """
+    Tells whether an error raised for a GitHub response is a rate limit worth retrying.
+    """
+    if not isinstance(exc, HTTPException):
+        return False
+    return exc.status_code == 429 or (
+        exc.status_code == 403 and "rate limit" in str(exc.detail).lower()
+    )
+
+
+def content_from_added_patch(patch: str) -> str | None:
+    """
+    Rebuilds a newly added file from its patch, which consists of a single hunk
+    adding every line of the file.
+
+    Args:
+        patch (str): The ``patch`` of an added file from the pull request files listing.
+
+    Returns:
+        str | None: The file contents, or None if the patch is not a complete addition
+        (for instance because GitHub truncated it).
+    """
+    header, _, body = patch.partition("\n")
+    if not header.startswith("@@ -0,0 +"):
+        return None
+    added_range = header[len("@@ -0,0 +"):].partition(" ")[0]
+    expected = int(added_range.partition(",")[2] or 1)
+
+    lines = body.split("\n") if body else []
+    trailing_newline = True
+    if lines and lines[-1].startswith("\\"):
+        # "\ No newline at end of file"
+        lines.pop()
+        trailing_newline = False
+    if len(lines) != expected or not all(line.startswith("+") for line in lines):
+        return None
+    content = "\n".join(line[1:] for line in lines)
+    return content + "\n" if trailing_newline and lines else content
+
+
+def parse_unified_diff(diff_text: str) -> list:
+    """
+    Extracts the added and removed lines of every file in a unified diff.
+
+    A plain line scan: header lines are only recognised before a file's first hunk, so
+    changed lines whose content starts with ``++`` or ``--`` are classified correctly.
+
+    Args:
+        diff_text (str): A ``git diff`` style unified diff covering one or more files.
+
+    Returns:
+        List of dictionaries with the filename and its added and removed lines.
+    """
+    changed_files = []
+    current = None
+    in_hunk = False
+    # Bound appenders of the current file's lists, to skip the lookups on every line.
+    add_added = add_removed = None
+    for line in diff_text.splitlines():
+        if line.startswith("diff --git "):
+            current = {
+                "filename": line.rpartition(" b/")[2],
+                "added_lines": [],
+                "removed_lines": [],
+            }
+            changed_files.append(current)
+            add_added = current["added_lines"].append
+            add_removed = current["removed_lines"].append
+            in_hunk = False
+        elif current is None:
+            continue
+        elif line.startswith("@@"):
+            in_hunk = True
+        elif in_hunk:
+            marker = line[:1]
+            if marker == "+":
+                add_added(line[1:])
+            elif marker == "-":
+                add_removed(line[1:])
+        elif line.startswith("+++ b/"):
+            current["filename"] = line[6:]
+    return changed_files
 
 
 class GitHubIntegration:
@@ -55,45 +360,181 @@ class GitHubIntegration:
         """
         self.config = get_config()
         self.github_api_key = self._get_github_api_key(user_login, repo_full_name)
-        try:
-            if base_url:
-                self.github = Github(
-                    base_url=base_url, login_or_token=self.github_api_key
-                )
-            else:
-                self.github = Github(login_or_token=self.github_api_key)
-            self.repository = self.github.get_repo(repo_full_name)
-        except UnknownObjectException:
-            raise HTTPException(
-                status_code=404, detail=f"Repository {repo_full_name} not found"
-            )
-        except GithubException as e:
-            raise HTTPException(status_code=e.status, detail=str(e))
+        self.repo_full_name = repo_full_name
+        self.client = get_http_client(self.github_api_key, base_url or GITHUB_API_URL)
+        # Values are (ttl, result) pairs so each entry can carry its own lifetime.
+        self._cache = TLRUCache(maxsize=2048, ttu=lambda _key, value, now: now + value[0])
+        self.rate_limit_remaining = None
+        self.rate_limiter = get_rate_limiter(self.github_api_key)
+        self.blob_cache = get_blob_cache()
 
     def _get_github_api_key(self, user_login: str, repo_full_name: str) -> str:
-        # Logic to get the GitHub API key
+        """
+        Picks the API key for a user, falling back to the repository owner's key
+        and then to the default key.
+
+        Raises:
+            HTTPException: 401 if no key is configured for the request.
+        """
+        api_keys = get_github_api_keys()
         api_key = (
-            self.config.get("user_keys", {}).get(user_login, {}).get("api_key")
-            or self.config.get("repo_owner_keys", {})
-            .get(repo_full_name.split("/")[0], {})
-            .get("api_key")
-            or self.config["github"]["default_api_key"]
+            api_keys.get(f"user:{user_login}")
+            or api_keys.get(f"owner:{repo_full_name.split('/', 1)[0]}")
+            or api_keys["default"]
         )
         if not api_key:
-            raise ValueError("No GitHub API key found for integration")
+            raise HTTPException(status_code=401, detail="No GitHub API key found")
         return api_key
 
-    def fetch_open_pull_requests(self):
+    @retry(
+        retry=retry_if_exception(_is_rate_limited),
+        wait=wait_random_exponential(min=1, max=60),
+        stop=stop_after_attempt(5),
+        reraise=True,
+    )
+    async def _request(self, method: str, path: str, **kwargs) -> httpx.Response:
+        """
+        Issues a request against the repository's REST endpoints.
+
+        Args:
+            method (str): HTTP method.
+            path (str): Path relative to ``/repos/{owner}/{repo}``.
+            **kwargs: Extra arguments forwarded to ``httpx.AsyncClient.request``.
+
+        Returns:
+            httpx.Response: The successful response.
+
+        Requests are throttled by the token's shared rate limiter and retried with backoff
+        when GitHub reports a primary or secondary rate limit. A ``json`` body is encoded
+        with orjson rather than httpx's stdlib encoder. GET requests are made conditional
+        on the ETag of the last response to them, which is reused on a 304.
+
+        Raises:
+            HTTPException: If GitHub answers with an error status.
+        """
+        if "json" in kwargs:
+            kwargs["content"] = orjson.dumps(kwargs.pop("json"))
+            kwargs["headers"] = {
+                **kwargs.get("headers", {}),
+                "Content-Type": "application/json",
+            }
+        etag_key = cached = None
+        if method == "GET":
+            headers = kwargs.get("headers") or {}
+            etag_key = (
+                self.github_api_key,
+                str(self.client.base_url),
+                self.repo_full_name,
+                path,
+                tuple(sorted((kwargs.get("params") or {}).items())),
+                headers.get("Accept"),
+            )
+            cached = _ETAG_CACHE.get(etag_key)
+            if cached is not None:
+                kwargs["headers"] = {**headers, "If-None-Match": cached.headers["ETag"]}
+        async with self.rate_limiter:
+            response = await self.client.request(
+                method, f"/repos/{self.repo_full_name}{path}", **kwargs
+            )
+            self.rate_limiter.update(response)
+        if response.status_code == 304 and cached is not None:
+            return cached
+        response = self._raise_for_status(response)
+        if (
+            etag_key is not None
+            and "ETag" in response.headers
+            and len(response.content) < ETAG_CACHE_BYTES
+        ):
+            _ETAG_CACHE[etag_key] = response
+        return response
+
+    def _invalidate(self, method_name: str, *args) -> None:
+        """
+        Drops the cached result of a read cached with ``_cached_read``.
+
+        Args:
+            method_name (str): Name of the cached method.
+            *args: The arguments the result was cached for.
+        """
+        self._cache.pop((self.repo_full_name, method_name, args), None)
+
+    def _raise_for_status(self, response: httpx.Response) -> httpx.Response:
+        """
+        Converts GitHub error responses into HTTP exceptions understood by FastAPI,
+        and records the remaining rate-limit budget.
+        """
+        remaining = response.headers.get("X-RateLimit-Remaining")
+        if remaining is not None:
+            self.rate_limit_remaining = int(remaining)
+        if response.status_code == 404:
+            raise HTTPException(
+                status_code=404, detail=f"{response.request.url.path} not found"
+            )
+        if response.is_error:
+            raise HTTPException(status_code=response.status_code, detail=response.text)
+        return response
+
+    async def _iter_pages(self, path: str, params: dict = None):
+        """
+        Yields the items of every page of a list endpoint, page by page.
+
+        Pages are requested at GitHub's maximum size of ``PER_PAGE`` items. The first
+        page's ``Link: rel="last"`` header tells how many pages exist; the remaining
+        pages are then requested concurrently and yielded in page order as they arrive.
+
+        Args:
+            path (str): Path relative to ``/repos/{owner}/{repo}``.
+            params (dict, optional): Query parameters sent with every page.
+
+        Yields:
+            list: The items of one page.
+        """
+        params = {"per_page": PER_PAGE, **(params or {})}
+        response = await self._request("GET", path, params=params)
+        yield orjson.loads(response.content)
+        if "last" not in response.links:
+            return
+
+        last_page = int(httpx.URL(response.links["last"]["url"]).params["page"])
+        pages = [
+            asyncio.ensure_future(
+                self._request("GET", path, params={**params, "page": page})
+            )
+            for page in range(2, last_page + 1)
+        ]
+        try:
+            for page in pages:
+                yield orjson.loads((await page).content)
+        finally:
+            for page in pages:
+                page.cancel()
+
+    async def _get_paginated(self, path: str, params: dict = None) -> list:
+        """
+        Fetches every page of a list endpoint.
+
+        Args:
+            path (str): Path relative to ``/repos/{owner}/{repo}``.
+            params (dict, optional): Query parameters sent with every page.
+
+        Returns:
+            list: The concatenated items of all pages, in page order.
+        """
+        return [item async for page in self._iter_pages(path, params) for item in page]
+
+    @_cached_read(ttl=60)
+    async def fetch_open_pull_requests(self):
         """
         Fetch open pull requests from the repository.
 
         Returns:
             List of open pull requests.
         """
-        logger.info("Fetching open PRs from: %s", self.repository.full_name)
-        return self.repository.get_pulls(state="open")
+        logger.info("Fetching open PRs from: %s", self.repo_full_name)
+        return await self._get_paginated("/pulls", params={"state": "open"})
 
-    def fetch_pull_request(self, pr_number):
+    @_cached_read(ttl=60)
+    async def fetch_pull_request(self, pr_number):
         """
         Fetch a specific pull request.
 
@@ -101,63 +542,152 @@ class GitHubIntegration:
             pr_number (int): Pull request number.
 
         Returns:
-            PullRequest object.
+            Dictionary describing the pull request.
         """
         logger.info("Fetching PR #%d", pr_number)
-        return self.repository.get_pull(pr_number)
+        response = await self._request("GET", f"/pulls/{pr_number}")
+        return orjson.loads(response.content)
 
-    def fetch_commit(self, commit_sha):
+    @_cached_read(ttl=3600)
+    async def fetch_commit(self, commit_sha):
         """
         Fetch a specific commit.
 
+        Commits are immutable, so they are cached for much longer than other reads.
+
         Args:
             commit_sha (str): Commit SHA.
 
         Returns:
-            Commit object.
+            Dictionary describing the commit.
         """
         logger.info("Fetching commit: %s", commit_sha)
-        return self.repository.get_commit(commit_sha)
+        response = await self._request("GET", f"/commits/{commit_sha}")
+        return orjson.loads(response.content)
 
-    def fetch_files_from_pr(self, pr_number):
+    async def fetch_files_from_pr(self, pr_number, need_full_content: bool = True):
         """
-        Fetch files from a pull request and detect their language.
+        Fetch files from a pull request and detect their language. Binary and generated
+        files are left out, see :func:`is_skipped_path`.
 
         Args:
             pr_number (int): Pull request number.
+            need_full_content (bool): Whether to download each file's contents. Diff-only
+                reviews pass False, leaving ``content`` as None and saving one request per file.
 
         Returns:
             List of file details including language.
         """
+        return [
+            file async for file in self.iter_files_from_pr(pr_number, need_full_content)
+        ]
+
+    async def iter_files_from_pr(self, pr_number, need_full_content: bool = True):
+        """
+        Yields the files of a pull request as soon as each one is available.
+
+        Files are yielded while later pages and contents are still being fetched, so
+        callers can start processing the first files without waiting for the whole PR.
+        Binary and generated files are skipped before any other work is spent on them.
+
+        Args:
+            pr_number (int): Pull request number.
+            need_full_content (bool): Whether to download each file's contents. Diff-only
+                reviews pass False, leaving ``content`` as None and saving one request per file.
+
+        Yields:
+            dict: File details including language, in no particular order.
+        """
         logger.info("Fetching files from PR #%d", pr_number)
-        pr = self.fetch_pull_request(pr_number)
-        files = pr.get_files()
+        async for page in self._iter_pages(f"/pulls/{pr_number}/files"):
+            files = [
+                file
+                for file in page
+                if file["status"] != "removed" and not is_skipped_path(file["filename"])
+            ]
+            if not need_full_content:
+                for file in files:
+                    yield self._file_details(file, None)
+                continue
+
+            # Each entry carries the sha of its blob at the PR head, so the contents can
+            # be fetched by sha concurrently instead of resolving every path against a ref.
+            async def _with_content(file):
+                return file, await self._get_file_content(file)
+
+            pending = [asyncio.ensure_future(_with_content(file)) for file in files]
+            try:
+                for next_done in asyncio.as_completed(pending):
+                    file, content = await next_done
+                    yield self._file_details(file, content)
+            finally:
+                for task in pending:
+                    task.cancel()
+
+    @staticmethod
+    def _file_details(file: dict, content: str | None) -> dict:
+        """
+        Builds the file details returned for an entry of the pull request files listing.
+        """
+        return {
+            "filename": file["filename"],
+            "sha": file["sha"],
+            "content": content,
+            "patch": file.get("patch"),
+            "language": detect_language(file["filename"]),
+            "additions": file["additions"],
+            "deletions": file["deletions"],
+            "changes": file["changes"],
+            "status": file["status"],
+            "url": file["contents_url"],
+        }
 
-        file_details = [
-            {
-                "filename": file.filename,
-                "content": self._get_decoded_contents(pr, file),
-                "patch": file.patch,
-                "language": detect_language(file.filename),
-                "additions": file.additions,
-                "deletions": file.deletions,
-                "changes": file.changes,
-                "status": file.status,
-                "url": file.contents_url,
-            }
-            for file in files
-            if file.status != "removed"
-        ]
+    async def _get_file_content(self, file: dict) -> str:
+        """
+        Returns the contents of a PR file at the head of the PR.
+
+        The patch of an added file already holds the whole file, so the blob is only
+        downloaded when that shortcut does not apply or the patch was truncated.
+
+        Args:
+            file (dict): An entry of the pull request files listing.
+
+        Returns:
+            str: The file contents.
+        """
+        if file["status"] == "added" and file.get("patch"):
+            content = content_from_added_patch(file["patch"])
+            if content is not None:
+                return content
+        return await self._get_blob(file["sha"])
+
+    async def _get_blob(self, sha: str) -> str:
+        """
+        Fetches a blob by sha as raw bytes, skipping the base64 envelope of the JSON form.
 
-        return file_details
+        Blobs are content-addressed, so they are kept in the on-disk blob cache and
+        repeated reviews of the same PR do not download them again.
 
-    def _get_decoded_contents(self, pr, file):
-        file_content = self.repository.get_contents(
-            file.filename, ref=pr.head.sha
-        ).content
-        return b64decode(file_content).decode("utf-8")
+        Args:
+            sha (str): The blob sha.
 
-    def post_comment_on_pr(self, pr_number, comment):
+        Returns:
+            str: The decoded blob contents.
+        """
+        if self.blob_cache is not None:
+            data = await asyncio.to_thread(self.blob_cache.get, sha)
+            if data is not None:
+                return data.decode("utf-8")
+
+        response = await self._request(
+            "GET", f"/git/blobs/{sha}", headers={"Accept": "application/vnd.github.raw"}
+        )
+        data = response.content
+        if self.blob_cache is not None:
+            await asyncio.to_thread(self.blob_cache.put, sha, data)
+        return data.decode("utf-8")
+
+    async def post_comment_on_pr(self, pr_number, comment):
         """
         Post a comment on a pull request.
 
@@ -166,10 +696,42 @@ class GitHubIntegration:
             comment (str): Comment text.
         """
         logger.info("Posting comment on PR #%d", pr_number)
-        pr = self.fetch_pull_request(pr_number)
-        pr.create_issue_comment(comment)
+        await self._request(
+            "POST", f"/issues/{pr_number}/comments", json={"body": comment}
+        )
+        # The comment count and update time of the cached pull request are now stale.
+        self._invalidate("fetch_pull_request", pr_number)
+
+    async def post_review(self, pr_number, comments, body=""):
+        """
+        Post file comments on a pull request as a single review, in one request.
+
+        Comments on files with a diff are attached inline at the start of the file's
+        diff; the others are appended to the review body.
 
-    def post_comment_on_commit(self, commit_sha, path, position, body):
+        Args:
+            pr_number (int): Pull request number.
+            comments (list): Dictionaries with the file ``path``, the comment ``body`` and
+                whether the file ``has_diff``.
+            body (str): Text opening the review.
+        """
+        logger.info("Posting review with %d comments on PR #%d", len(comments), pr_number)
+        inline = [
+            {"path": comment["path"], "position": 1, "body": comment["body"]}
+            for comment in comments
+            if comment["has_diff"]
+        ]
+        body = "\n\n---\n\n".join(
+            [body] + [comment["body"] for comment in comments if not comment["has_diff"]]
+        ).strip()
+        await self._request(
+            "POST",
+            f"/pulls/{pr_number}/reviews",
+            json={"event": "COMMENT", "body": body, "comments": inline},
+        )
+        self._invalidate("fetch_pull_request", pr_number)
+
+    async def post_comment_on_commit(self, commit_sha, path, position, body):
         """
         Post a comment on a specific line of a file in a commit, useful in pull request reviews.
 
@@ -180,13 +742,18 @@ class GitHubIntegration:
             body (str): Comment text.
         """
         logger.info("Posting comment on commit: %s, file: %s", commit_sha, path)
-        commit = self.fetch_commit(commit_sha)
-        commit.create_comment(body, path, position)
+        await self._request(
+            "POST",
+            f"/commits/{commit_sha}/comments",
+            json={"body": body, "path": path, "position": position},
+        )
 
-    def get_pr_diffs(self, pr_number):
+    async def get_pr_diffs(self, pr_number):
         """
         Fetch diff data for all files in a pull request, extracting changed lines.
 
+        The whole pull request is downloaded as a single unified diff and scanned once.
+
         Args:
             pr_number (int): Pull request number.
 
@@ -194,70 +761,79 @@ class GitHubIntegration:
             List of dictionaries representing file changes.
         """
         logger.info("Fetching diffs for PR #%d", pr_number)
-        pr = self.fetch_pull_request(pr_number)
-        diffs = pr.get_files()
-
-        changed_files = []
-        for diff in diffs:
-            patch_set = PatchSet(diff.patch)
-            for patched_file in patch_set:
-                file_changes = {
-                    "filename": patched_file.path,
-                    "added_lines": [
-                        line.value
-                        for hunk in patched_file
-                        for line in hunk
-                        if line.is_added
-                    ],
-                    "modified_lines": [
-                        line.value
-                        for hunk in patched_file
-                        for line in hunk
-                        if line.is_modified
-                    ],
-                }
-                changed_files.append(file_changes)
-
-        return changed_files
-
-    def fetch_files_in_folder(self, folder_path):
-        """
-        Fetch all files in a specific folder of the repository.
+        response = await self._request(
+            "GET",
+            f"/pulls/{pr_number}",
+            headers={"Accept": "application/vnd.github.v3.diff"},
+        )
+
+        return parse_unified_diff(response.text)
+
+    @_cached_read(ttl=120)
+    async def fetch_files_in_folder(self, folder_path):
+        """
+        Fetch all files in a specific folder of the repository, including its subfolders.
+
+        The default branch's tree is listed recursively in a single request and the
+        matching blobs, binary files aside, are then fetched concurrently.
 
         Args:
             folder_path (str): Path to the folder in the repository.
 
         Returns:
-            List of file details (name, content).
+            List of file details (name, path, content).
         """
         logger.info("Fetching files from folder: %s", folder_path)
-        contents = self.repository.get_contents(folder_path)
-        file_details = []
-        for content in contents:
-            if content.type == "file":
-                file_content = b64decode(content.content).decode("utf-8")
-                file_details.append({"name": content.name, "content": file_content})
-        return file_details
+        repo = await self.fetch_repo_info()
+        response = await self._request(
+            "GET", f"/git/trees/{repo['default_branch']}", params={"recursive": "1"}
+        )
+        tree = orjson.loads(response.content)
+        if tree.get("truncated"):
+            logger.warning(
+                "Tree of %s is truncated, some files may be missing", self.repo_full_name
+            )
+
+        prefix = folder_path.strip("/")
+        prefix = f"{prefix}/" if prefix else ""
+        files = [
+            entry
+            for entry in tree["tree"]
+            if entry["type"] == "blob"
+            and entry["path"].startswith(prefix)
+            and not is_binary_path(entry["path"])
+        ]
+        contents = await asyncio.gather(*(self._get_blob(file["sha"]) for file in files))
+        return [
+            {
+                "name": file["path"].rpartition("/")[2],
+                "path": file["path"],
+                "content": content,
+            }
+            for file, content in zip(files, contents)
+        ]
 
-    def fetch_repo_info(self):
+    @_cached_read(ttl=300)
+    async def fetch_repo_info(self):
         """
         Fetch information about the GitHub repository.
 
         Returns:
             Dictionary containing repository information.
         """
-        repo = self.repository
-        logger.info("Fetching info for repository: %s", repo.full_name)
+        logger.info("Fetching info for repository: %s", self.repo_full_name)
+        response = await self._request("GET", "")
+        repo = orjson.loads(response.content)
         return {
-            "full_name": repo.full_name,
-            "description": repo.description,
-            "html_url": repo.html_url,
-            "created_at": repo.created_at.isoformat(),
-            "updated_at": repo.updated_at.isoformat(),
-            "default_branch": repo.default_branch,
-            "fork": repo.fork,
-            "forks_count": repo.forks_count,
-            "open_issues_count": repo.open_issues_count,
-            "watchers_count": repo.watchers_count,
-            "language": repo.language,
+            "full_name": repo["full_name"],
+            "description": repo["description"],
+            "html_url": repo["html_url"],
+            "created_at": repo["created_at"],
+            "updated_at": repo["updated_at"],
+            "default_branch": repo["default_branch"],
+            "fork": repo["fork"],
+            "forks_count": repo["forks_count"],
+            "open_issues_count": repo["open_issues_count"],
+            "watchers_count": repo["watchers_count"],
+            "language": repo["language"],
         }
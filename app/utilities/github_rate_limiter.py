@@ -0,0 +1,106 @@
+"""Module providing a client-side limiter that keeps GitHub API usage within its rate limits."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on in-flight requests per token; GitHub's secondary rate limits
+# penalise large bursts of concurrent requests.
+MAX_CONCURRENT_REQUESTS = 16
+
+# Shared limiters keyed by API key, since GitHub accounts rate limits per token.
+_RATE_LIMITERS = {}
+
+
+class GitHubRateLimiter:
+    """
+    Throttles requests made with one GitHub token.
+
+    Works as a token bucket whose level is the ``X-RateLimit-Remaining`` budget reported
+    by GitHub and which refills at ``X-RateLimit-Reset``. Requests beyond the budget, or
+    made while a ``Retry-After`` back-off is in force, wait instead of being rejected.
+    Concurrency is additionally capped by a semaphore.
+    """
+
+    def __init__(self, max_concurrency: int = MAX_CONCURRENT_REQUESTS):
+        """
+        Initializes the limiter.
+
+        Args:
+            max_concurrency (int): The maximum number of requests in flight at once.
+        """
+        self._slots = asyncio.Semaphore(max_concurrency)
+        self.remaining = None
+        self.reset_at = 0.0
+        self.blocked_until = 0.0
+
+    def delay(self, now: float | None = None) -> float:
+        """
+        Returns how long the next request has to wait, in seconds.
+
+        Args:
+            now (float, optional): The current epoch time; defaults to ``time.time()``.
+        """
+        now = time.time() if now is None else now
+        wait_until = self.blocked_until
+        if self.remaining is not None and self.remaining <= 0:
+            wait_until = max(wait_until, self.reset_at)
+        return max(0.0, wait_until - now)
+
+    def update(self, response: httpx.Response) -> None:
+        """
+        Refreshes the budget from the rate-limit headers of a GitHub response.
+
+        Args:
+            response (httpx.Response): The response to a request made with this token.
+        """
+        headers = response.headers
+        remaining = headers.get("X-RateLimit-Remaining")
+        if remaining is not None:
+            self.remaining = int(remaining)
+        reset = headers.get("X-RateLimit-Reset")
+        if reset is not None:
+            self.reset_at = float(reset)
+        retry_after = headers.get("Retry-After")
+        if retry_after is not None and response.status_code in (403, 429):
+            self.blocked_until = max(self.blocked_until, time.time() + float(retry_after))
+
+    async def __aenter__(self):
+        await self._slots.acquire()
+        delay = self.delay()
+        if delay:
+            logger.warning("GitHub rate limit reached, waiting %.1f seconds", delay)
+            try:
+                await asyncio.sleep(delay)
+            except BaseException:
+                # __aexit__ does not run when entering fails, e.g. on cancellation.
+                self._slots.release()
+                raise
+        if self.remaining is not None:
+            self.remaining -= 1
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self._slots.release()
+
+
+def get_rate_limiter(api_key: str) -> GitHubRateLimiter:
+    """
+    Returns the process-wide rate limiter for an API key.
+
+    Args:
+        api_key (str): GitHub API token the limiter accounts for.
+
+    Returns:
+        GitHubRateLimiter: The limiter shared by every integration using the token.
+    """
+    limiter = _RATE_LIMITERS.get(api_key)
+    if limiter is None:
+        limiter = _RATE_LIMITERS[api_key] = GitHubRateLimiter()
+    return limiter
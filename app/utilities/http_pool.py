@@ -0,0 +1,40 @@
+"""Module providing the connection pool shared by every outbound HTTP client."""
+
+from __future__ import annotations
+
+from functools import lru_cache
+
+import httpx
+
+# One pool serves GitHub and OpenAI alike; connections are kept per host, so each API
+# keeps its own HTTP/2 connections while clients with different credentials share them.
+MAX_CONNECTIONS = 100
+MAX_KEEPALIVE_CONNECTIONS = 64
+
+
+@lru_cache(maxsize=1)
+def get_http_transport() -> httpx.AsyncHTTPTransport:
+    """
+    Returns the process-wide HTTP/2 transport, so that every client reuses its kept-alive
+    connections instead of opening and handshaking its own.
+
+    Returns:
+        httpx.AsyncHTTPTransport: The shared transport.
+    """
+    return httpx.AsyncHTTPTransport(
+        http2=True,
+        limits=httpx.Limits(
+            max_connections=MAX_CONNECTIONS,
+            max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+        ),
+    )
+
+
+async def close_http_transport():
+    """
+    Closes the shared transport and its connections; called when the application shuts down.
+    """
+    if get_http_transport.cache_info().currsize:
+        transport = get_http_transport()
+        get_http_transport.cache_clear()
+        await transport.aclose()
@@ -0,0 +1,103 @@
+"""Module providing an on-disk index from file extensions to pygments language names."""
+
+from __future__ import annotations
+
+import fnmatch
+import logging
+import os
+import re
+import tempfile
+from functools import lru_cache
+
+import orjson
+import pygments
+from pygments.lexers import get_all_lexers
+
+from app.config_loader import get_config
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LEXER_INDEX_PATH = "~/.cache/codereviewbot/pygments_index.json"
+
+
+def build_lexer_index() -> dict[str, str]:
+    """
+    Maps every extension claimed by exactly one lexer to that lexer's name.
+
+    Only the lexers' filename patterns are read, so no lexer module is imported. Extensions
+    shared by several lexers are left out: pygments settles those by analysing the text,
+    so they still go through ``guess_lexer_for_filename``.
+
+    Returns:
+        dict[str, str]: Lowercase extensions, with their dot, mapped to language names.
+    """
+    claims = {}
+    globs = []
+    for name, _aliases, patterns, _mimetypes in get_all_lexers():
+        for pattern in patterns:
+            extension = pattern[1:]
+            if pattern.startswith("*.") and not any(char in extension for char in "*?["):
+                claims.setdefault(extension, set()).add(name)
+            else:
+                globs.append((name, re.compile(fnmatch.translate(pattern))))
+
+    index = {}
+    for extension, names in claims.items():
+        # Lookups are lowercased, so an uppercase pattern can never match them.
+        if extension != extension.lower():
+            continue
+        filename = f"file{extension}"
+        names = names | {name for name, glob in globs if glob.match(filename)}
+        if len(names) == 1:
+            index[extension] = names.pop()
+    return index
+
+
+def _load(path: str) -> dict[str, str] | None:
+    try:
+        with open(path, "rb") as file:
+            stored = orjson.loads(file.read())
+    except (OSError, orjson.JSONDecodeError):
+        return None
+    # The lexers shipped with pygments change between releases.
+    if stored.get("pygments") != pygments.__version__:
+        return None
+    return stored["index"]
+
+
+def _store(path: str, index: dict[str, str]) -> None:
+    try:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as file:
+                file.write(orjson.dumps({"pygments": pygments.__version__, "index": index}))
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    except OSError as e:
+        logger.warning("Could not store the lexer index in %s: %s", path, e)
+
+
+@lru_cache(maxsize=1)
+def get_lexer_index() -> dict[str, str]:
+    """
+    Returns the extension index, read from the file configured as ``cache.lexer_index``
+    and rebuilt there when it is missing or was built by another pygments release.
+
+    Returns:
+        dict[str, str]: Lowercase extensions mapped to language names.
+    """
+    path = os.environ.get(
+        "CODEREVIEWBOT_LEXER_INDEX",
+        get_config().get("cache", {}).get("lexer_index", DEFAULT_LEXER_INDEX_PATH),
+    )
+    if not path:
+        return build_lexer_index()
+    path = os.path.expanduser(path)
+    index = _load(path)
+    if index is None:
+        index = build_lexer_index()
+        _store(path, index)
+    return index
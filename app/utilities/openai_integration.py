@@ -2,27 +2,102 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
+import os
+from functools import lru_cache
 
+import msgspec
 import openai
+import orjson
 from tenacity import retry, stop_after_attempt, wait_random_exponential
 
 from app.config_loader import get_config
+from app.models.openai_schema import (decode_batch_output,
+                                      decode_summary_and_review)
 from app.services.salesforce.salesforce_handler import SF_LANGUAGE_TO_PROMPT
+from app.utilities.completion_cache import completion_key, get_completion_cache
+from app.utilities.http_pool import get_http_transport
+from app.utilities.token_budget import input_budget, truncate_to_tokens
 
 logger = logging.getLogger(__name__)
 
 
+def get_max_llm_concurrency() -> int:
+    """
+    Returns how many completions may be in flight at once, from the
+    ``CODEREVIEWBOT_MAX_LLM_CONCURRENCY`` environment variable or ``concurrency.max_llm``.
+    """
+    return int(
+        os.environ.get(
+            "CODEREVIEWBOT_MAX_LLM_CONCURRENCY",
+            get_config().get("concurrency", {}).get("max_llm", 4),
+        )
+    )
+
+
+def _load_prompt_templates(config: dict) -> dict:
+    """
+    Reads the review prompt templates from ``languages.<language>.prompt_template``,
+    skipping templates without a ``{code}`` placeholder.
+
+    Args:
+        config (dict): The configuration settings.
+
+    Returns:
+        dict: The usable templates keyed by language.
+    """
+    templates = {}
+    for language, language_config in config.get("languages", {}).items():
+        template = language_config.get("prompt_template")
+        if template is None:
+            continue
+        if "{code}" not in template:
+            logger.warning(
+                "Ignoring the %s prompt template, it has no {code} placeholder", language
+            )
+            continue
+        templates[language] = template
+    return templates
+
+
 class OpenAIIntegration:
     """Provides integration with OpenAI's API for text generation and code review."""
 
-    def __init__(self, api_key: str = None, model: str = None):
+    DIFF_PREFIX = (
+        "This is a diff from GitHub with lines prefixed with + for additions and - for deletions."
+    )
+    FULL_FILE_PREFIX = "This is a full file from a Pull Request."
+    DEFAULT_PROMPT_TEMPLATE = (
+        "{prompt_prefix} It is written in {language}. Review it for readability, maintainability, "
+        "security, and best practices. Highlight areas for improvement or potential bugs, suggesting "
+        "specific changes or alternatives. Provide practical, actionable advice, focusing on "
+        "idiomatic responses and code snippets where applicable.\n\n{code}"
+    )
+
+    def __init__(
+        self, api_key: str = None, model: str = None, max_concurrency: int = None
+    ):
         self.config = get_config()
         self.api_key = api_key or self.config["openai"]["api_key"]
         self.model = model or self.config["openai"]["default_model"]
-        self.openai_client = openai.OpenAI(api_key=self.api_key)
+        # The shared HTTP/2 pool multiplexes concurrent completions over kept-alive
+        # connections, whichever integration issues them.
+        self.openai_client = openai.AsyncOpenAI(
+            api_key=self.api_key,
+            http_client=openai.DefaultAsyncHttpxClient(transport=get_http_transport()),
+        )
+        # Caps the completions in flight, however many files or PRs are fanned out.
+        self._completion_slots = asyncio.Semaphore(
+            max_concurrency or get_max_llm_concurrency()
+        )
+        self.completion_cache = get_completion_cache()
+        # Resolved once per configuration, so building a prompt is a single lookup per
+        # file while reload_config() still takes effect on cached integrations.
+        self._templates_config = self.config
+        self._prompt_templates = _load_prompt_templates(self.config)
 
-    def gpt_prompt(self, text):
+    async def gpt_prompt(self, text):
         """
         Generate a summary for the provided text using the OpenAI API.
 
@@ -33,10 +108,10 @@ class OpenAIIntegration:
         Returns:
             dict: A dictionary containing the OpenAI API response.
         """
-        return self._create_completion([{"role": "user", "content": text}])
+        return await self._create_completion([{"role": "user", "content": text}])
 
     @retry(wait=wait_random_exponential(min=1, max=60), stop=stop_after_attempt(3))
-    def summarize_text(
+    async def summarize_text(
         self,
         text,
         prompt_prefix="Summarize the following code. Not the prompt before the code.",
@@ -51,11 +126,12 @@ class OpenAIIntegration:
         Returns:
             dict: A dictionary containing the OpenAI API response.
         """
-        prompt = f"{prompt_prefix}:\n\n{text}"
-        return self._create_completion([{"role": "user", "content": prompt}])
+        return await self._create_completion(
+            self.build_summary_messages(text, prompt_prefix)
+        )
 
     @retry(wait=wait_random_exponential(min=1, max=60), stop=stop_after_attempt(3))
-    def review_code(self, code, **kwargs):
+    async def review_code(self, code, **kwargs):
         """
         Generate a code review for the provided code snippet using the OpenAI API.
 
@@ -70,17 +146,287 @@ class OpenAIIntegration:
         Returns:
             dict: A dictionary containing the OpenAI API response.
         """
-        language = kwargs.get("language", "Python")
-        is_diff = kwargs.get("is_diff", False)
-        temperature = kwargs.get("temperature", 0.7)
-        max_tokens = kwargs.get("max_tokens", 2048)
+        return await self._create_completion(**self.build_review_request(code, **kwargs))
+
+    def build_review_request(
+        self, code, language="Python", is_diff=False, temperature=0.7, max_tokens=2048
+    ):
+        """
+        Builds the parameters of a review completion, shared by synchronous and batched
+        reviews so that both are generated the same way.
+
+        Args:
+            code (str): The code snippet to review.
+            language (str): The programming language of the code.
+            is_diff (bool): Indicates if the code snippet is a diff.
+            temperature (float): Controls the randomness of the output.
+            max_tokens (int): The maximum number of tokens to generate.
+
+        Returns:
+            dict: The messages and sampling parameters of the request.
+        """
+        return {
+            "messages": self.build_review_messages(code, language, is_diff),
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+        }
+
+    @retry(wait=wait_random_exponential(min=1, max=60), stop=stop_after_attempt(3))
+    async def summarize_and_review(self, code, language="Python", is_diff=False):
+        """
+        Generate a summary and a code review for a code snippet in a single completion.
+
+        The code and the language instructions are sent once instead of once per task,
+        and the model is constrained to answer with a JSON object.
+
+        Args:
+            code (str): The code snippet to summarize and review.
+            language (str): The programming language of the code.
+            is_diff (bool): Indicates if the code snippet is a diff.
+
+        Returns:
+            dict: The ``summary`` and ``review`` texts.
 
+        Raises:
+            ValueError: If the model's answer is not the expected JSON object.
+        """
+        def decode(response):
+            try:
+                result = decode_summary_and_review(response["choices"][0]["text"])
+            except msgspec.DecodeError as e:
+                raise ValueError(f"Completion is missing the summary or review: {e}") from e
+            return {"summary": result.summary, "review": result.review}
+
+        return await self._create_completion(
+            self.build_summary_and_review_messages(code, language, is_diff),
+            decode=decode,
+            response_format={"type": "json_object"},
+        )
+
+    def build_summary_and_review_messages(self, code, language="Python", is_diff=False):
+        """
+        Builds the chat messages asking for a summary and a review as one JSON object.
+
+        Args:
+            code (str): The code snippet to summarize and review.
+            language (str): The programming language of the code.
+            is_diff (bool): Indicates if the code snippet is a diff.
+
+        Returns:
+            list: Chat messages ready to be sent to the completions endpoint.
+        """
+        diff_indicator = (
+            "This is a diff so treat '+' as additions and '-' as subtractions."
+            if is_diff
+            else "This is a full file, not a diff."
+        )
+        code = self.fit_to_context(
+            code,
+            self._generate_code_review_prompt("", language, is_diff) + diff_indicator,
+        )
+        review_prompt = self._generate_code_review_prompt(code, language, is_diff)
+        return [
+            {
+                "role": "system",
+                "content": 'Return strict JSON: {"summary": string, "review": string}.',
+            },
+            {
+                "role": "user",
+                "content": (
+                    f"Put a summary of this file from a PR in 'summary'. {diff_indicator}\n"
+                    f"Put the following code review in 'review'.\n\n{review_prompt}"
+                ),
+            },
+        ]
+
+    @retry(wait=wait_random_exponential(min=1, max=60), stop=stop_after_attempt(3))
+    async def summarize_files(self, texts, prompt_prefix):
+        """
+        Generate summaries for several small files in a single completion.
+
+        Args:
+            texts (dict): Mapping of filenames to the text to summarize.
+            prompt_prefix (str): The instructions for each summary.
+
+        Returns:
+            dict: Summaries keyed by filename; files the model left out are missing.
+
+        Raises:
+            ValueError: If the model's answer is not a JSON object.
+        """
+        def decode(response):
+            result = orjson.loads(response["choices"][0]["text"])
+            if not isinstance(result, dict):
+                raise ValueError("Completion is not a JSON object")
+            return {
+                filename: result[filename]
+                for filename in texts
+                if isinstance(result.get(filename), str)
+            }
+
+        return await self._create_completion(
+            self.build_file_summaries_messages(texts, prompt_prefix),
+            decode=decode,
+            response_format={"type": "json_object"},
+        )
+
+    @staticmethod
+    def build_file_summaries_messages(texts, prompt_prefix):
+        """
+        Builds the chat messages asking for the summaries of several files as one JSON
+        object keyed by filename.
+
+        Args:
+            texts (dict): Mapping of filenames to the text to summarize.
+            prompt_prefix (str): The instructions for each summary.
+
+        Returns:
+            list: Chat messages ready to be sent to the completions endpoint.
+        """
+        files = "\n\n".join(f"File: {filename}\n{text}" for filename, text in texts.items())
+        return [
+            {
+                "role": "system",
+                "content": "Return strict JSON mapping each filename to its summary string.",
+            },
+            {"role": "user", "content": f"{prompt_prefix}\n\n{files}"},
+        ]
+
+    def build_summary_messages(
+        self,
+        text,
+        prompt_prefix="Summarize the following code. Not the prompt before the code.",
+    ):
+        """
+        Builds the chat messages used to summarize a piece of text.
+
+        Args:
+            text (str): The text to summarize.
+            prompt_prefix (str): The prefix to add to the prompt for context.
+
+        Returns:
+            list: Chat messages ready to be sent to the completions endpoint.
+        """
+        text = self.fit_to_context(text, f"{prompt_prefix}:\n\n")
+        return [{"role": "user", "content": f"{prompt_prefix}:\n\n{text}"}]
+
+    def fit_to_context(self, text, prompt=""):
+        """
+        Truncates text so that it fits in the model's context window next to a prompt,
+        leaving room for the response, instead of having the request rejected.
+
+        Args:
+            text (str): The text sent to the model.
+            prompt (str): The static part of the prompt sent along with the text; its
+                token count is computed once per model.
+
+        Returns:
+            str: The text, cut down if it was too long.
+        """
+        budget = input_budget(self.model, prompt)
+        # A token spans at least one character, so short texts need no tokenizing.
+        if len(text) <= budget:
+            return text
+        truncated = truncate_to_tokens(text, budget, self.model)
+        if len(truncated) < len(text):
+            logger.warning(
+                "Truncated input from %d to %d characters to fit %s",
+                len(text),
+                len(truncated),
+                self.model,
+            )
+        return truncated
+
+    def build_review_messages(self, code, language="Python", is_diff=False):
+        """
+        Builds the chat messages used to review a code snippet.
+
+        Args:
+            code (str): The code snippet to review.
+            language (str): The programming language of the code.
+            is_diff (bool): Indicates if the code snippet is a diff.
+
+        Returns:
+            list: Chat messages ready to be sent to the completions endpoint.
+        """
+        code = self.fit_to_context(
+            code, self._generate_code_review_prompt("", language, is_diff)
+        )
         prompt = self._generate_code_review_prompt(code, language, is_diff)
-        return self._create_completion(
-            [{"role": "user", "content": prompt}],
-            temperature=temperature,
-            max_tokens=max_tokens,
+        return [{"role": "user", "content": prompt}]
+
+    async def create_batch(self, requests):
+        """
+        Submits chat completion requests as a single OpenAI Batch API job.
+
+        Batch jobs are billed at a discount and do not count against the
+        synchronous rate limits, at the cost of completing asynchronously
+        within the 24 hour completion window.
+
+        Args:
+            requests (dict): Mapping of custom ids to request parameters, holding at
+                least the chat ``messages``.
+
+        Returns:
+            str: The id of the created batch.
+        """
+        lines = (
+            orjson.dumps(
+                {
+                    "custom_id": custom_id,
+                    "method": "POST",
+                    "url": "/v1/chat/completions",
+                    "body": {"model": self.model, **request},
+                }
+            )
+            for custom_id, request in requests.items()
         )
+        batch_input = await self.openai_client.files.create(
+            file=("batch.jsonl", b"\n".join(lines)),
+            purpose="batch",
+        )
+        batch = await self.openai_client.batches.create(
+            input_file_id=batch_input.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h",
+        )
+        logger.info("Submitted batch %s with %d requests", batch.id, len(requests))
+        return batch.id
+
+    async def wait_for_batch(self, batch_id, poll_interval=30, max_poll_interval=600):
+        """
+        Waits for a batch job to finish and collects its completions.
+
+        Args:
+            batch_id (str): The id returned by :meth:`create_batch`.
+            poll_interval (float): Initial delay between status checks, in seconds.
+            max_poll_interval (float): Upper bound for the backed-off delay.
+
+        Returns:
+            dict: Mapping of custom ids to the generated text.
+
+        Raises:
+            RuntimeError: If the batch fails, expires or is cancelled.
+        """
+        while True:
+            batch = await self.openai_client.batches.retrieve(batch_id)
+            if batch.status == "completed":
+                break
+            if batch.status in ("failed", "expired", "cancelled"):
+                raise RuntimeError(f"Batch {batch_id} ended with status {batch.status}")
+            await asyncio.sleep(poll_interval)
+            poll_interval = min(poll_interval * 2, max_poll_interval)
+
+        if not batch.output_file_id:
+            return {}
+        output = await self.openai_client.files.content(batch.output_file_id)
+        results = {}
+        for custom_id, text, error in decode_batch_output(output.content):
+            if text is None:
+                logger.error("Batch request %s failed: %s", custom_id, error)
+                continue
+            results[custom_id] = text
+        return results
 
     def _generate_code_review_prompt(self, code, language, is_diff):
         """
@@ -94,46 +440,67 @@ class OpenAIIntegration:
         Returns:
             str: The generated prompt for the OpenAI API.
         """
+        diff_prefix = self.DIFF_PREFIX if is_diff else self.FULL_FILE_PREFIX
         if language.startswith("Salesforce"):
             prompt_prefix = SF_LANGUAGE_TO_PROMPT.get(language, "")
-            diff_prefix = (
-                "This is a diff from GitHub with lines prefixed with + for additions and - for deletions."
-                if is_diff
-                else "This is a full file from a Pull Request."
+            # Languages without a dedicated prompt skip the empty line.
+            prompt = "\n".join(
+                part for part in (diff_prefix, prompt_prefix, "Code:", code) if part
             )
-            prompt = f"{diff_prefix}\n{prompt_prefix}\nCode:\n{code}"
         else:
-            prompt_prefix = (
-                "This is a diff from GitHub with lines prefixed with + for additions and - for deletions."
-                if is_diff
-                else "This is a full file from a Pull Request."
-            )
-            prompt_template = (
-                self.config.get("languages", {})
-                .get(language, {})
-                .get(
-                    "prompt_template",
-                    "{prompt_prefix} It is written in {language}. Review it for readability, maintainability, "
-                    "security, and best practices. Highlight areas for improvement or potential bugs, suggesting "
-                    "specific changes or alternatives. Provide practical, actionable advice, focusing on "
-                    "idiomatic responses and code snippets where applicable.\n\n{code}",
-                )
+            config = get_config()
+            if config is not self._templates_config:
+                self._templates_config = config
+                self._prompt_templates = _load_prompt_templates(config)
+            prompt_template = self._prompt_templates.get(
+                language, self.DEFAULT_PROMPT_TEMPLATE
             )
             prompt = prompt_template.format(
-                prompt_prefix=prompt_prefix, language=language, code=code
+                prompt_prefix=diff_prefix, language=language, code=code
             )
 
         return prompt
 
-    def _create_completion(self, messages, **kwargs):
+    async def _create_completion(self, messages, decode=None, **kwargs):
+        """
+        Sends a chat completion request, or answers it from the completion cache.
+
+        A completion is only cached once ``decode`` accepted it and if the model was not
+        cut off by the token limit, so a retry after a malformed or truncated answer asks
+        the model again instead of being served the same answer.
+
+        Args:
+            messages (list): The chat messages.
+            decode (callable, optional): Turns the parsed response into the result,
+                raising ValueError if the answer is unusable.
+            **kwargs: Other request parameters.
+
+        Returns:
+            The decoded result, or the parsed response if no ``decode`` is given.
+        """
+        decode = decode or (lambda response: response)
+        key = None
+        if self.completion_cache is not None:
+            key = completion_key(self.model, messages, **kwargs)
+            cached = await asyncio.to_thread(self.completion_cache.get, key)
+            if cached is not None:
+                return decode(cached)
         try:
-            response = self.openai_client.chat.completions.create(
-                model=self.model, messages=messages, **kwargs
-            )
-            return self._parse_response(response)
+            async with self._completion_slots:
+                response = await self.openai_client.chat.completions.create(
+                    model=self.model, messages=messages, **kwargs
+                )
+            result = self._parse_response(response)
         except Exception as e:
             logger.error("OpenAI API call failed: %s", e)
             raise
+        decoded = decode(result)
+        truncated = any(
+            choice["finish_reason"] == "length" for choice in result["choices"]
+        )
+        if key is not None and not truncated:
+            await asyncio.to_thread(self.completion_cache.put, key, result)
+        return decoded
 
     def _parse_response(self, response):
         """
@@ -158,3 +525,32 @@ class OpenAIIntegration:
                 for choice in response.choices
             ],
         }
+
+
+@lru_cache(maxsize=64)
+def _openai_integration(api_key: str, model: str) -> OpenAIIntegration:
+    """Builds one OpenAIIntegration per API key and model and reuses it afterwards."""
+    return OpenAIIntegration(api_key=api_key, model=model)
+
+
+def get_openai_integration(
+    api_key: str | None = None, model: str | None = None
+) -> OpenAIIntegration:
+    """
+    Returns the process-wide OpenAI integration for an API key and model, so that
+    requests share its client and kept-alive connections.
+
+    The defaults are looked up on every call rather than at import time, so a
+    configuration reload takes effect without restarting the worker.
+
+    Args:
+        api_key (str | None): The OpenAI API key, or None for the configured key.
+        model (str | None): The model name, or None for the configured default model.
+
+    Returns:
+        OpenAIIntegration: The shared integration for that key and model.
+    """
+    openai_config = get_config()["openai"]
+    return _openai_integration(
+        api_key or openai_config["api_key"], model or openai_config["default_model"]
+    )
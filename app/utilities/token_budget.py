@@ -0,0 +1,155 @@
+"""Module for counting prompt tokens and keeping requests within a model's context window."""
+
+from __future__ import annotations
+
+import logging
+from functools import lru_cache
+
+import tiktoken
+
+logger = logging.getLogger(__name__)
+
+# Context window sizes, matched by model name prefix (longest prefix first).
+MODEL_CONTEXT_TOKENS = {
+    "gpt-4o": 128000,
+    "gpt-4-turbo": 128000,
+    "gpt-4-32k": 32768,
+    "gpt-4": 8192,
+    "gpt-3.5-turbo": 16385,
+}
+DEFAULT_CONTEXT_TOKENS = 8192
+
+# Tokens kept free for the completion itself and the chat message framing.
+RESPONSE_TOKENS = 2048
+MESSAGE_OVERHEAD_TOKENS = 16
+
+# Rough ratio used when no tokenizer is available for a model.
+CHARS_PER_TOKEN = 4
+
+
+@lru_cache(maxsize=16)
+def _get_encoding(model: str):
+    """Loads the tokenizer for a model once, or returns None if it cannot be loaded."""
+    try:
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            return tiktoken.get_encoding("cl100k_base")
+    except Exception as e:  # pylint: disable=broad-except
+        # The encodings are downloaded on first use and may be unreachable.
+        logger.warning("No tokenizer for %s, estimating token counts: %s", model, e)
+        return None
+
+
+def context_window(model: str) -> int:
+    """
+    Returns the context window of a model, in tokens.
+
+    Args:
+        model (str): The model name.
+    """
+    for prefix, tokens in MODEL_CONTEXT_TOKENS.items():
+        if model.startswith(prefix):
+            return tokens
+    return DEFAULT_CONTEXT_TOKENS
+
+
+def count_tokens(text: str, model: str) -> int:
+    """
+    Counts the tokens a text takes up for a model.
+
+    Args:
+        text (str): The text to count.
+        model (str): The model name.
+
+    Returns:
+        int: The number of tokens, estimated from the length if no tokenizer is available.
+    """
+    encoding = _get_encoding(model)
+    if encoding is None:
+        return -(-len(text) // CHARS_PER_TOKEN)
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+@lru_cache(maxsize=256)
+def count_prompt_tokens(prompt: str, model: str) -> int:
+    """
+    Counts the tokens of a static prompt, which is only tokenized once per model.
+
+    Args:
+        prompt (str): A prompt or prompt prefix that does not depend on the input.
+        model (str): The model name.
+    """
+    return count_tokens(prompt, model)
+
+
+def input_budget(model: str, prompt: str = "") -> int:
+    """
+    Returns how many tokens of input fit next to a prompt and the reserved response.
+
+    Args:
+        model (str): The model name.
+        prompt (str): The static part of the prompt sent along with the input.
+    """
+    return (
+        context_window(model)
+        - count_prompt_tokens(prompt, model)
+        - RESPONSE_TOKENS
+        - MESSAGE_OVERHEAD_TOKENS
+    )
+
+
+def truncate_to_tokens(text: str, max_tokens: int, model: str) -> str:
+    """
+    Cuts a text down to at most ``max_tokens`` tokens.
+
+    Args:
+        text (str): The text to truncate.
+        max_tokens (int): The maximum number of tokens to keep.
+        model (str): The model name.
+
+    Returns:
+        str: The text, or its leading part if it was too long.
+    """
+    encoding = _get_encoding(model)
+    if encoding is None:
+        return text[: max(max_tokens, 0) * CHARS_PER_TOKEN]
+    tokens = encoding.encode(text, disallowed_special=())
+    if len(tokens) <= max_tokens:
+        return text
+    return encoding.decode(tokens[: max(max_tokens, 0)])
+
+
+def chunk_by_tokens(
+    text: str, max_tokens: int, model: str, overlap: int = 200
+) -> list[str]:
+    """
+    Splits a text into overlapping windows of at most ``max_tokens`` tokens each.
+
+    Args:
+        text (str): The text to split.
+        max_tokens (int): The maximum number of tokens per chunk.
+        model (str): The model name.
+        overlap (int): The number of tokens shared by consecutive chunks, so that
+            constructs cut at a boundary still appear whole in one of them.
+
+    Returns:
+        list[str]: The chunks, or just the text itself if it fits in one.
+    """
+    step = max(max_tokens - overlap, 1)
+    encoding = _get_encoding(model)
+    if encoding is None:
+        max_chars, step = max_tokens * CHARS_PER_TOKEN, step * CHARS_PER_TOKEN
+        if len(text) <= max_chars:
+            return [text]
+        return [
+            text[start:start + max_chars]
+            for start in range(0, len(text) - overlap * CHARS_PER_TOKEN, step)
+        ]
+    tokens = encoding.encode(text, disallowed_special=())
+    if len(tokens) <= max_tokens:
+        return [text]
+    return [
+        encoding.decode(tokens[start:start + max_tokens])
+        for start in range(0, len(tokens) - overlap, step)
+    ]
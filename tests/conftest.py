@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+import os
+
+import pytest
+
+# Importing app.main configures logging; keep the test run from writing app.log.
+os.environ.setdefault("CODEREVIEWBOT_LOG_FILE", "")
+
+from app.api.dependencies import _github_integration, _pr_processor  # noqa: E402
+from app.utilities.blob_cache import get_blob_cache  # noqa: E402
+from app.utilities.completion_cache import get_completion_cache  # noqa: E402
+from app.utilities.lexer_index import get_lexer_index  # noqa: E402
+from app.utilities.openai_integration import _openai_integration  # noqa: E402
+
+# The on-disk caches and everything holding on to one of them.
+_CACHED_FACTORIES = (
+    get_blob_cache,
+    get_completion_cache,
+    get_lexer_index,
+    _openai_integration,
+    _github_integration,
+    _pr_processor,
+)
+
+
+def _clear_cached_factories():
+    for factory in _CACHED_FACTORIES:
+        factory.cache_clear()
+
+
+@pytest.fixture(autouse=True)
+def isolated_caches(tmp_path, monkeypatch):
+    """Keeps every test's caches in its own temporary directory instead of ~/.cache."""
+    monkeypatch.setenv("CODEREVIEWBOT_BLOB_CACHE_DIR", str(tmp_path / "blobs"))
+    monkeypatch.setenv("CODEREVIEWBOT_COMPLETION_CACHE", str(tmp_path / "completions.db"))
+    monkeypatch.setenv("CODEREVIEWBOT_LEXER_INDEX", str(tmp_path / "pygments_index.json"))
+    _clear_cached_factories()
+    yield
+    _clear_cached_factories()
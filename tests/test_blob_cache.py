@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+import os
+
+from app.utilities.blob_cache import BlobCache
+
+
+def test_round_trip(tmp_path):
+    cache = BlobCache(str(tmp_path), max_bytes=1024)
+    assert cache.get("abc123") is None
+    cache.put("abc123", b"print('hi')\n")
+    assert cache.get("abc123") == b"print('hi')\n"
+    assert (tmp_path / "ab" / "abc123").exists()
+
+
+def test_evicts_least_recently_read(tmp_path):
+    cache = BlobCache(str(tmp_path), max_bytes=250)
+    cache.put("aa01", b"x" * 100)
+    cache.put("bb02", b"y" * 100)
+    os.utime(tmp_path / "aa" / "aa01", (1, 1))
+    cache.put("cc03", b"z" * 100)
+
+    assert cache.get("aa01") is None
+    assert cache.get("bb02") == b"y" * 100
+    assert cache.get("cc03") == b"z" * 100
+
+
+def test_entry_evicted_during_read_is_a_miss(tmp_path, monkeypatch):
+    cache = BlobCache(str(tmp_path), max_bytes=1024)
+    cache.put("abc123", b"data")
+
+    def evicted(path, *args, **kwargs):
+        os.remove(path)
+        raise FileNotFoundError(path)
+
+    monkeypatch.setattr(os, "utime", evicted)
+    assert cache.get("abc123") is None
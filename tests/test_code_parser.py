@@ -2,7 +2,10 @@ from __future__ import annotations
 
 import pytest
 
-from app.code_parser import JavascriptParser, PythonParser
+from app import code_parser
+from app.code_parser import (PROCESS_POOL_MIN_SIZE, JavascriptParser,
+                             PythonParser, minify_code_async,
+                             shutdown_process_pool)
 
 
 class TestParsers:
@@ -33,9 +36,108 @@ async def async_test_function():
         assert len(snippets) == 2
         assert snippets[0] == "def test_function():\n    print('Hello, world!')"
 
+    def test_python_parser_parse_functions_methods_and_nested(self, python_parser):
+        test_code = """
+class Greeter:
+    def greet(self):
+        def inner():
+            return 'hi'
+        return inner()
+"""
+
+        snippets = python_parser.parse_functions(test_code)
+        assert len(snippets) == 1
+        assert snippets[0].startswith("def greet(self):")
+
+        snippets = python_parser.parse_functions(test_code, include_nested=True)
+        assert len(snippets) == 2
+        assert snippets[1] == "def inner():\n    return 'hi'"
+
     def test_javascript_parser_minify_code(self, javascript_parser):
         content = "function add(x, y) { return x + y; }"
         minified_code = javascript_parser.minify_code(content)
         assert minified_code == "function add(x,y){return x+y;}"
 
     # Add more tests as needed
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("anyio_backend", ["asyncio"])
+async def test_minify_code_async(anyio_backend):
+    small = "def add(x, y): return x + y"
+    assert await minify_code_async(small, "Python") == "def add(x,y):return x+y"
+    assert await minify_code_async(small, "Plain text") == small
+    # Languages without a minifier never reach the worker pool, however large the input.
+    assert await minify_code_async("x" * 10 * PROCESS_POOL_MIN_SIZE, "XML") == "x" * (
+        10 * PROCESS_POOL_MIN_SIZE
+    )
+    assert code_parser._PROCESS_POOL is None
+
+    large = "\n".join(f"def f{i}(x, y): return x + y" for i in range(200))
+    try:
+        minified = await minify_code_async(large, "Python")
+    finally:
+        shutdown_process_pool()
+    assert minified.count("return x+y") == 200
+
+
+def test_single_code_parser_module():
+    import importlib.util
+
+    import app.code_parser
+
+    assert all(hasattr(app.code_parser, name) for name in app.code_parser.__all__)
+    assert importlib.util.find_spec("app.utilities.code_parser") is None
+
+
+def test_result_cache_is_bounded_by_size(monkeypatch):
+    cache = code_parser.LRUCache(maxsize=100, getsizeof=code_parser._result_size)
+    monkeypatch.setattr(code_parser, "_RESULT_CACHE", cache)
+    monkeypatch.setattr(code_parser, "RESULT_CACHE_CHARS", 100)
+    parser = PythonParser()
+
+    parser.minify_code("a = 1")
+    parser.minify_code("b = 2")
+    assert len(cache) == 2
+    assert cache.currsize == len("a=1") + len("b=2") + 2
+
+    # Results larger than the whole cache are returned without being stored.
+    large = "\n".join(f"x{i} = {i}" for i in range(50))
+    assert parser.minify_code(large).count("=") == 50
+    assert len(cache) == 2
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("anyio_backend", ["asyncio"])
+async def test_pooled_results_are_cached_in_the_parent(anyio_backend, monkeypatch):
+    cache = code_parser.LRUCache(maxsize=10**6, getsizeof=code_parser._result_size)
+    monkeypatch.setattr(code_parser, "_RESULT_CACHE", cache)
+    large = "\n".join(f"def g{i}(x, y): return x - y" for i in range(200))
+    try:
+        minified = await minify_code_async(large, "Python")
+    finally:
+        shutdown_process_pool()
+    assert len(cache) == 1
+
+    def no_pool():
+        raise AssertionError("a cached input reached the process pool")
+
+    monkeypatch.setattr(code_parser, "_get_process_pool", no_pool)
+    assert await minify_code_async(large, "Python") == minified
+    assert PythonParser().minify_code(large) == minified
+
+
+def test_parser_processes_split_the_cpus_between_workers(monkeypatch):
+    monkeypatch.delenv("CODEREVIEWBOT_PARSER_PROCESSES", raising=False)
+    monkeypatch.setattr(code_parser.os, "cpu_count", lambda: 16)
+    config = {"operation_mode": {"webhook_server": {"workers": 4}}}
+    monkeypatch.setattr(code_parser, "get_config", lambda: config)
+    assert code_parser.get_parser_processes() == 4
+
+    config["operation_mode"]["webhook_server"]["workers"] = None
+    assert code_parser.get_parser_processes() == 1
+
+    config["concurrency"] = {"parser_processes": 3}
+    assert code_parser.get_parser_processes() == 3
+    monkeypatch.setenv("CODEREVIEWBOT_PARSER_PROCESSES", "2")
+    assert code_parser.get_parser_processes() == 2
@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+from app.utilities.completion_cache import CompletionCache, completion_key
+
+
+def test_round_trip(tmp_path):
+    cache = CompletionCache(str(tmp_path / "cache.db"), ttl=60)
+    key = completion_key("gpt-test", [{"role": "user", "content": "hi"}])
+    assert cache.get(key) is None
+    cache.put(key, {"choices": [{"text": "hello"}]})
+    assert cache.get(key) == {"choices": [{"text": "hello"}]}
+
+
+def test_expired_entries_are_not_served(tmp_path):
+    cache = CompletionCache(str(tmp_path / "cache.db"), ttl=0)
+    cache.put("key", {"choices": []})
+    assert cache.get("key") is None
+
+
+def test_key_depends_on_model_and_parameters():
+    messages = [{"role": "user", "content": "hi"}]
+    assert completion_key("a", messages) != completion_key("b", messages)
+    assert completion_key("a", messages) != completion_key(
+        "a", messages, response_format={"type": "json_object"}
+    )
@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+from app.config_loader import get_config, get_github_api_keys
+
+
+def test_get_config_is_parsed_once():
+    get_config.cache_clear()
+    first = get_config()
+    assert get_config() is first
+    assert get_config.cache_info().misses == 1
+
+
+def test_get_config_cache_clear_reloads():
+    first = get_config()
+    get_config.cache_clear()
+    reloaded = get_config()
+    assert reloaded is not first
+    assert reloaded == first
+
+
+def test_get_github_api_keys_flattens_config():
+    api_keys = get_github_api_keys()
+    assert api_keys["default"] == "MY_GITHUB_TOKEN"
+    assert api_keys["user:alice"] == "alice_github_api_key"
+    assert api_keys["owner:octocat"] == "octocat_github_api_key"
@@ -0,0 +1,365 @@
+from __future__ import annotations
+
+import json
+
+import httpx
+import pytest
+from fastapi import HTTPException
+from tenacity import wait_none
+
+from app.utilities import github_integration
+from app.utilities.github_integration import (GitHubIntegration,
+                                              content_from_added_patch,
+                                              parse_unified_diff)
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+def make_integration(handler) -> GitHubIntegration:
+    integration = GitHubIntegration(user_login="alice", repo_full_name="octo/repo")
+    integration.client = httpx.AsyncClient(
+        base_url="https://api.github.com", transport=httpx.MockTransport(handler)
+    )
+    integration.blob_cache = None
+    return integration
+
+
+@pytest.mark.anyio
+async def test_fetch_open_pull_requests_fetches_all_pages():
+    requested_pages = []
+
+    def handler(request):
+        assert request.url.params["per_page"] == "100"
+        page = int(request.url.params.get("page", "1"))
+        requested_pages.append(page)
+        headers = {}
+        if page == 1:
+            headers["Link"] = (
+                '<https://api.github.com/repos/octo/repo/pulls?state=open&page=2>; rel="next", '
+                '<https://api.github.com/repos/octo/repo/pulls?state=open&page=3>; rel="last"'
+            )
+        return httpx.Response(200, json=[{"number": page}], headers=headers)
+
+    integration = make_integration(handler)
+    pull_requests = await integration.fetch_open_pull_requests()
+
+    assert [pr["number"] for pr in pull_requests] == [1, 2, 3]
+    assert sorted(requested_pages) == [1, 2, 3]
+
+
+SAMPLE_DIFF = """diff --git a/app/main.py b/app/main.py
+index 1111111..2222222 100644
+--- a/app/main.py
++++ b/app/main.py
+@@ -1,3 +1,3 @@
+ import logging
+-import os
++import sys
++++counter
+diff --git a/old.txt b/old.txt
+deleted file mode 100644
+--- a/old.txt
++++ /dev/null
+@@ -1 +0,0 @@
+-gone
+diff --git a/logo.png b/logo.png
+Binary files a/logo.png and b/logo.png differ
+"""
+
+
+def test_parse_unified_diff():
+    assert parse_unified_diff(SAMPLE_DIFF) == [
+        {
+            "filename": "app/main.py",
+            "added_lines": ["import sys", "++counter"],
+            "removed_lines": ["import os"],
+        },
+        {"filename": "old.txt", "added_lines": [], "removed_lines": ["gone"]},
+        {"filename": "logo.png", "added_lines": [], "removed_lines": []},
+    ]
+
+
+def test_missing_api_key_is_unauthorized(monkeypatch):
+    monkeypatch.setattr(
+        "app.utilities.github_integration.get_github_api_keys",
+        lambda: {"default": None},
+    )
+    with pytest.raises(HTTPException) as exc_info:
+        GitHubIntegration(user_login="nobody", repo_full_name="octo/repo")
+    assert exc_info.value.status_code == 401
+
+
+@pytest.mark.anyio
+async def test_fetch_files_from_pr_reads_blobs_by_sha():
+    def handler(request):
+        if request.url.path.endswith("/pulls/7/files"):
+            return httpx.Response(
+                200,
+                json=[
+                    {
+                        "filename": "app/main.py",
+                        "sha": "abc123",
+                        "status": "modified",
+                        "patch": "@@ -1 +1 @@\n-a\n+b",
+                        "additions": 1,
+                        "deletions": 1,
+                        "changes": 2,
+                        "contents_url": "https://api.github.com/contents/app/main.py",
+                    },
+                    {
+                        "filename": "old.py",
+                        "sha": "def456",
+                        "status": "removed",
+                        "additions": 0,
+                        "deletions": 3,
+                        "changes": 3,
+                        "contents_url": "https://api.github.com/contents/old.py",
+                    },
+                ],
+            )
+        assert request.url.path == "/repos/octo/repo/git/blobs/abc123"
+        assert request.headers["Accept"] == "application/vnd.github.raw"
+        return httpx.Response(200, content=b"print('b')\n")
+
+    integration = make_integration(handler)
+    files = await integration.fetch_files_from_pr(7)
+
+    assert [file["filename"] for file in files] == ["app/main.py"]
+    assert files[0]["content"] == "print('b')\n"
+    assert files[0]["language"] == "Python"
+
+
+@pytest.mark.anyio
+async def test_request_retries_secondary_rate_limit(monkeypatch):
+    monkeypatch.setattr(GitHubIntegration._request.retry, "wait", wait_none())
+    attempts = []
+
+    def handler(request):
+        attempts.append(request)
+        if len(attempts) == 1:
+            return httpx.Response(
+                403, json={"message": "You have exceeded a secondary rate limit."}
+            )
+        return httpx.Response(200, json={"full_name": "octo/repo"})
+
+    integration = make_integration(handler)
+    response = await integration._request("GET", "")
+
+    assert response.json() == {"full_name": "octo/repo"}
+    assert len(attempts) == 2
+
+
+@pytest.mark.anyio
+async def test_fetch_files_from_pr_skips_contents_for_diffs():
+    def handler(request):
+        assert request.url.path == "/repos/octo/repo/pulls/7/files"
+        return httpx.Response(
+            200,
+            json=[
+                {
+                    "filename": "app/main.py",
+                    "sha": "abc123",
+                    "status": "modified",
+                    "patch": "@@ -1 +1 @@\n-a\n+b",
+                    "additions": 1,
+                    "deletions": 1,
+                    "changes": 2,
+                    "contents_url": "https://api.github.com/contents/app/main.py",
+                }
+            ],
+        )
+
+    integration = make_integration(handler)
+    files = await integration.fetch_files_from_pr(7, need_full_content=False)
+
+    assert files[0]["content"] is None
+    assert files[0]["patch"] == "@@ -1 +1 @@\n-a\n+b"
+
+
+@pytest.mark.anyio
+async def test_repeated_pull_request_and_commit_reads_are_cached():
+    requested_paths = []
+
+    def handler(request):
+        requested_paths.append(request.url.path)
+        return httpx.Response(200, json={"path": request.url.path})
+
+    integration = make_integration(handler)
+    for _ in range(3):
+        await integration.fetch_pull_request(7)
+        await integration.fetch_commit("abc123")
+
+    assert requested_paths == [
+        "/repos/octo/repo/pulls/7",
+        "/repos/octo/repo/commits/abc123",
+    ]
+
+
+def test_content_from_added_patch():
+    assert content_from_added_patch("@@ -0,0 +1,2 @@\n+a\n+b") == "a\nb\n"
+    assert (
+        content_from_added_patch("@@ -0,0 +1,2 @@\n+a\n+b\n\\ No newline at end of file")
+        == "a\nb"
+    )
+    # Truncated patches and modifications still need the blob.
+    assert content_from_added_patch("@@ -0,0 +1,3 @@\n+a\n+b") is None
+    assert content_from_added_patch("@@ -1,2 +1,2 @@\n-a\n+b") is None
+
+
+@pytest.mark.anyio
+async def test_fetch_files_in_folder_lists_tree_once():
+    def handler(request):
+        path = request.url.path
+        if path == "/repos/octo/repo":
+            repo = dict.fromkeys(
+                [
+                    "full_name",
+                    "description",
+                    "html_url",
+                    "created_at",
+                    "updated_at",
+                    "fork",
+                    "forks_count",
+                    "open_issues_count",
+                    "watchers_count",
+                    "language",
+                ]
+            )
+            return httpx.Response(200, json={**repo, "default_branch": "main"})
+        if path == "/repos/octo/repo/git/trees/main":
+            assert request.url.params["recursive"] == "1"
+            return httpx.Response(
+                200,
+                json={
+                    "truncated": False,
+                    "tree": [
+                        {"path": "src", "type": "tree", "sha": "t1"},
+                        {"path": "src/a.py", "type": "blob", "sha": "b1"},
+                        {"path": "src/pkg/b.py", "type": "blob", "sha": "b2"},
+                        {"path": "srcfile.py", "type": "blob", "sha": "b3"},
+                    ],
+                },
+            )
+        return httpx.Response(200, content=path.rpartition("/")[2].encode())
+
+    integration = make_integration(handler)
+    files = await integration.fetch_files_in_folder("src/")
+
+    assert files == [
+        {"name": "a.py", "path": "src/a.py", "content": "b1"},
+        {"name": "b.py", "path": "src/pkg/b.py", "content": "b2"},
+    ]
+
+
+@pytest.mark.anyio
+async def test_post_review_sends_all_comments_in_one_request():
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(200, json={"id": 1})
+
+    integration = make_integration(handler)
+    await integration.post_review(
+        7,
+        [
+            {"path": "a.py", "body": "Looks good.", "has_diff": True},
+            {"path": "big.bin", "body": "Binary file.", "has_diff": False},
+        ],
+        body="Automated review.",
+    )
+
+    assert len(requests) == 1
+    assert requests[0].url.path == "/repos/octo/repo/pulls/7/reviews"
+    assert json.loads(requests[0].content) == {
+        "event": "COMMENT",
+        "body": "Automated review.\n\n---\n\nBinary file.",
+        "comments": [{"path": "a.py", "position": 1, "body": "Looks good."}],
+    }
+
+
+@pytest.mark.anyio
+async def test_get_requests_revalidate_with_etag():
+    conditional = []
+
+    def handler(request):
+        conditional.append(request.headers.get("If-None-Match"))
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(
+            200,
+            text="diff --git a/a.py b/a.py\n+++ b/a.py\n@@ -0,0 +1 @@\n+x = 1\n",
+            headers={"ETag": '"v1"'},
+        )
+
+    github_integration._ETAG_CACHE.clear()
+    integration = make_integration(handler)
+    first = await integration.get_pr_diffs(7)
+    second = await integration.get_pr_diffs(7)
+
+    assert conditional == [None, '"v1"']
+    assert first == second
+
+    # Integrations share the cache, but only for the same token and repository.
+    other = make_integration(handler)
+    assert await other.get_pr_diffs(7) == first
+    assert conditional[-1] == '"v1"'
+    other.repo_full_name = "octo/other"
+    await other.get_pr_diffs(7)
+    assert conditional[-1] is None
+
+
+@pytest.mark.anyio
+async def test_fetch_files_from_pr_skips_binary_and_generated_files():
+    def listed(filename):
+        return {
+            "filename": filename,
+            "sha": "abc123",
+            "status": "modified",
+            "patch": "@@ -1 +1 @@\n-a\n+b",
+            "additions": 1,
+            "deletions": 1,
+            "changes": 2,
+            "contents_url": f"https://api.github.com/contents/{filename}",
+        }
+
+    def handler(request):
+        assert request.url.path == "/repos/octo/repo/pulls/7/files"
+        return httpx.Response(
+            200,
+            json=[
+                listed("assets/logo.png"),
+                listed("web/package-lock.json"),
+                listed("poetry.lock"),
+                listed("static/app.min.js"),
+                listed("app/main.py"),
+            ],
+        )
+
+    integration = make_integration(handler)
+    files = await integration.fetch_files_from_pr(7, need_full_content=False)
+
+    assert [file["filename"] for file in files] == ["app/main.py"]
+
+
+@pytest.mark.anyio
+async def test_posting_a_comment_invalidates_the_cached_pull_request():
+    fetches = []
+
+    def handler(request):
+        if request.method == "POST":
+            return httpx.Response(201, json={})
+        fetches.append(request)
+        return httpx.Response(200, json={"number": 7, "comments": len(fetches)})
+
+    integration = make_integration(handler)
+    await integration.fetch_pull_request(7)
+    await integration.fetch_pull_request(7)
+    assert len(fetches) == 1
+
+    await integration.post_comment_on_pr(7, "Looks good.")
+    pull_request = await integration.fetch_pull_request(7)
+    assert pull_request["comments"] == 2
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from app.utilities.github_rate_limiter import GitHubRateLimiter
+
+
+def test_waits_for_reset_once_budget_is_spent():
+    limiter = GitHubRateLimiter()
+    limiter.update(
+        httpx.Response(
+            200, headers={"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "1030"}
+        )
+    )
+    assert limiter.delay(now=1000) == 30
+    assert limiter.delay(now=1040) == 0
+
+
+def test_no_delay_while_budget_remains():
+    limiter = GitHubRateLimiter()
+    limiter.update(
+        httpx.Response(
+            200, headers={"X-RateLimit-Remaining": "10", "X-RateLimit-Reset": "1030"}
+        )
+    )
+    assert limiter.delay(now=1000) == 0
+
+
+def test_honours_retry_after_on_secondary_rate_limit():
+    limiter = GitHubRateLimiter()
+    limiter.update(httpx.Response(403, headers={"Retry-After": "60"}))
+    assert 59 < limiter.delay() <= 60
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("anyio_backend", ["asyncio"])
+async def test_cancelled_wait_releases_its_slot(anyio_backend):
+    limiter = GitHubRateLimiter(max_concurrency=1)
+    limiter.blocked_until = time.time() + 60
+
+    async def request():
+        async with limiter:
+            pass
+
+    task = asyncio.ensure_future(request())
+    await asyncio.sleep(0)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    limiter.blocked_until = 0.0
+    await asyncio.wait_for(request(), timeout=1)
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import pytest
+from fastapi import BackgroundTasks
+from httpx import AsyncClient
+from httpx._transports.asgi import ASGITransport
+
+from app.main import app
+from app.models.github_webhook_schema import decode_webhook_payload
+from app.services.webhooks.github_webhooks import handle_github_webhook
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+class FakeProcessor:
+    def __init__(self):
+        self.reviewed = []
+
+    async def review_pull_request(self, pr_number, process_diffs_only=False):
+        self.reviewed.append(pr_number)
+
+
+@pytest.mark.anyio
+async def test_webhook_review_runs_after_acknowledgement():
+    payload = decode_webhook_payload(
+        b'{"repository": {"full_name": "octo/repo"}, "sender": {"login": "alice"},'
+        b' "pull_request": {"number": 7}}'
+    )
+    processor = FakeProcessor()
+    background_tasks = BackgroundTasks()
+
+    response = await handle_github_webhook(payload, processor, background_tasks)
+
+    assert response == {"message": "Pull request queued for review"}
+    assert processor.reviewed == []
+    await background_tasks()
+    assert processor.reviewed == [7]
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize(
+    "event, body, message",
+    [
+        ("ping", b'{"zen": "Keep it simple."}', "Ignored ping event"),
+        (
+            "pull_request",
+            b'{"action": "closed", "repository": {"full_name": "octo/repo"},'
+            b' "sender": {"login": "alice"}, "pull_request": {"number": 7}}',
+            "Ignored pull request closed action",
+        ),
+    ],
+)
+async def test_webhook_ignores_events_that_do_not_change_code(event, body, message):
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as ac:
+        response = await ac.post(
+            "/github-webhook/", content=body, headers={"X-GitHub-Event": event}
+        )
+
+    assert response.status_code == 200
+    assert response.json() == {"message": message}
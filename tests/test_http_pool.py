@@ -0,0 +1,13 @@
+from __future__ import annotations
+
+from app.utilities.github_integration import get_http_client
+from app.utilities.http_pool import get_http_transport
+from app.utilities.openai_integration import OpenAIIntegration
+
+
+def test_github_and_openai_clients_share_one_connection_pool():
+    github_client = get_http_client("pool-test-key")
+    openai_integration = OpenAIIntegration(api_key="test-key", model="gpt-test")
+
+    assert github_client._transport is get_http_transport()
+    assert openai_integration.openai_client._client._transport is get_http_transport()
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import pytest
+from pygments.lexers import guess_lexer_for_filename
+
+from app.services.salesforce.salesforce_handler import \
+    detect_salesforce_language
+from app.utilities.github_integration import (_EXTENSION_LANGUAGES,
+                                              detect_language, is_binary_path,
+                                              is_skipped_path)
+
+
+@pytest.mark.parametrize("extension,language", sorted(_EXTENSION_LANGUAGES.items()))
+def test_extension_table_matches_pygments(extension, language):
+    assert guess_lexer_for_filename(f"file{extension}", "").name == language
+
+
+def test_detect_language():
+    assert detect_language("app/main.py") == "Python"
+    assert detect_language("src/index.JS") == "JavaScript"
+    assert detect_language("Makefile") == "Makefile"
+    assert detect_language("home/.bashrc") == "Bash"
+    assert detect_language("docs/v1.2/README") == "Unknown"
+    assert detect_language("data/blob.unknownext") == "Unknown"
+    assert (
+        detect_language("force-app/main/default/classes/Foo.cls") == "Salesforce Apex"
+    )
+
+
+def test_binary_files_are_not_detected():
+    assert is_binary_path("assets/Logo.PNG")
+    assert not is_binary_path("app/main.py")
+    assert not is_binary_path("home/.png")
+    assert detect_language("assets/logo.png") == "Unknown"
+    assert (
+        detect_language("force-app/main/default/staticresources/logo.png") == "Unknown"
+    )
+
+
+@pytest.mark.parametrize(
+    "path,skipped",
+    [
+        ("assets/logo.png", True),
+        ("yarn.lock", True),
+        ("web/Package-Lock.json", True),
+        ("go.sum", True),
+        ("static/app.min.js", True),
+        ("static/app.js.map", True),
+        ("static/app.js", False),
+        ("lockfile.py", False),
+        ("src/map.py", False),
+    ],
+)
+def test_is_skipped_path(path, skipped):
+    assert is_skipped_path(path) is skipped
+
+
+@pytest.mark.parametrize(
+    "path,language",
+    [
+        ("force-app/main/default/classes/Foo.cls-meta.xml", "Salesforce Metadata XML"),
+        ("force-app/main/default/pages/Home.page", "Salesforce Visualforce"),
+        ("force-app/main/default/aura/cmp/cmp.cmp", "Salesforce Aura Component"),
+        ("force-app/main/default/triggers/T.trigger", "Salesforce Apex"),
+        ("force-app/main/default/lwc/card/card.html", "Salesforce LWC"),
+        ("force-app/main/default/lwc/card/__tests__/card.test.js", "Salesforce LWC"),
+        ("force-app/test/__tests__/util.test.js", "Salesforce LWC Jest Test"),
+        ("force-app/main/default/staticresources/logo.png", "Salesforce Other"),
+        ("force-apps/main/default/classes/Foo.cls", None),
+        ("src/classes/Foo.cls", None),
+    ],
+)
+def test_detect_salesforce_language(path, language):
+    assert detect_salesforce_language(path) == language
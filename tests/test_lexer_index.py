@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+import orjson
+import pygments
+from pygments.lexers import guess_lexer_for_filename
+
+from app.utilities import lexer_index
+from app.utilities.lexer_index import build_lexer_index, get_lexer_index
+
+
+def test_index_matches_pygments_guesses():
+    index = build_lexer_index()
+
+    assert index[".zig"] == "Zig"
+    assert ".h" not in index  # claimed by C, C++ and Objective-C
+    for extension in (".zig", ".hs", ".tf", ".proto", ".nim", ".ex"):
+        assert index[extension] == guess_lexer_for_filename(f"file{extension}", "").name
+
+
+def test_index_is_stored_and_rebuilt_for_another_pygments(tmp_path):
+    path = tmp_path / "pygments_index.json"
+    index = get_lexer_index()
+    stored = orjson.loads(path.read_bytes())
+    assert stored == {"pygments": pygments.__version__, "index": index}
+
+    path.write_bytes(orjson.dumps({"pygments": "0.0", "index": {".py": "Stale"}}))
+    assert lexer_index._load(str(path)) is None
+    path.write_bytes(orjson.dumps({"pygments": pygments.__version__, "index": {".x": "X"}}))
+    get_lexer_index.cache_clear()
+    assert get_lexer_index() == {".x": "X"}
@@ -0,0 +1,226 @@
+from __future__ import annotations
+
+import json
+
+import httpx
+import openai
+import pytest
+from tenacity import wait_none
+
+from app.config_loader import get_config
+from app.utilities import openai_integration
+from app.utilities.completion_cache import CompletionCache
+from app.utilities.openai_integration import OpenAIIntegration
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+def make_integration(handler) -> OpenAIIntegration:
+    integration = OpenAIIntegration(api_key="test-key", model="gpt-test")
+    integration.completion_cache = None
+    integration.openai_client = openai.AsyncOpenAI(
+        api_key="test-key",
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+    )
+    return integration
+
+
+def completion(content: str, finish_reason: str = "stop") -> httpx.Response:
+    return httpx.Response(
+        200,
+        json={
+            "id": "chatcmpl-1",
+            "object": "chat.completion",
+            "created": 0,
+            "model": "gpt-test",
+            "choices": [
+                {
+                    "index": 0,
+                    "finish_reason": finish_reason,
+                    "message": {"role": "assistant", "content": content},
+                }
+            ],
+        },
+    )
+
+
+@pytest.mark.anyio
+async def test_summarize_and_review_uses_one_json_completion():
+    requests = []
+
+    def handler(request):
+        requests.append(json.loads(request.content))
+        return completion('{"summary": "Adds b.", "review": "Looks fine."}')
+
+    integration = make_integration(handler)
+    result = await integration.summarize_and_review("+b", language="Go", is_diff=True)
+
+    assert result == {"summary": "Adds b.", "review": "Looks fine."}
+    assert len(requests) == 1
+    assert requests[0]["response_format"] == {"type": "json_object"}
+    assert requests[0]["messages"][1]["content"].count("+b") == 1
+
+
+@pytest.mark.anyio
+async def test_completions_are_served_from_the_cache(tmp_path):
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return completion("A summary.")
+
+    integration = make_integration(handler)
+    integration.completion_cache = CompletionCache(str(tmp_path / "cache.db"), ttl=60)
+
+    first = await integration.summarize_text("print('a')")
+    second = await integration.summarize_text("print('a')")
+    await integration.summarize_text("print('b')")
+
+    assert first == second
+    assert first["choices"][0]["text"] == "A summary."
+    assert len(requests) == 2
+
+
+def test_review_prompt_uses_the_configured_template_or_the_default():
+    integration = OpenAIIntegration(api_key="test-key", model="gpt-test")
+    integration._prompt_templates = {"Python": "[{language}] {prompt_prefix} {code}"}
+
+    configured = integration._generate_code_review_prompt("x = 1", "Python", True)
+    default = integration._generate_code_review_prompt("x = 1", "Go", False)
+
+    assert configured == f"[Python] {OpenAIIntegration.DIFF_PREFIX} x = 1"
+    assert default.startswith(f"{OpenAIIntegration.FULL_FILE_PREFIX} It is written in Go.")
+    assert default.endswith("\n\nx = 1")
+
+
+@pytest.mark.parametrize("language", ["Python", "JavaScript", "Go"])
+def test_configured_review_prompts_contain_the_code(language):
+    integration = OpenAIIntegration(api_key="test-key", model="gpt-test")
+    code = "MARKER_1234 = compute()"
+
+    review = integration.build_review_messages(code, language=language, is_diff=True)
+    fused = integration.build_summary_and_review_messages(code, language=language)
+
+    assert code in review[0]["content"]
+    assert OpenAIIntegration.DIFF_PREFIX in review[0]["content"]
+    assert code in fused[1]["content"]
+
+
+def test_templates_without_a_code_placeholder_fall_back_to_the_default(monkeypatch):
+    config = get_config()
+    monkeypatch.setattr(
+        openai_integration,
+        "get_config",
+        lambda: {**config, "languages": {"Python": {"prompt_template": "Review it."}}},
+    )
+    integration = OpenAIIntegration(api_key="test-key", model="gpt-test")
+
+    prompt = integration._generate_code_review_prompt("MARKER_1234", "Python", False)
+
+    assert prompt.endswith("\n\nMARKER_1234")
+    assert "It is written in Python." in prompt
+
+
+@pytest.mark.anyio
+async def test_malformed_answers_are_retried_and_not_cached(tmp_path, monkeypatch):
+    monkeypatch.setattr(OpenAIIntegration.summarize_and_review.retry, "wait", wait_none())
+    answers = ['{"summary": "Adds b."', '{"summary": "Adds b.", "review": "Fine."}']
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return completion(answers[len(requests) - 1])
+
+    integration = make_integration(handler)
+    integration.completion_cache = CompletionCache(str(tmp_path / "cache.db"), ttl=60)
+
+    result = await integration.summarize_and_review("+b", is_diff=True)
+    again = await integration.summarize_and_review("+b", is_diff=True)
+
+    assert result == again == {"summary": "Adds b.", "review": "Fine."}
+    assert len(requests) == 2
+
+
+@pytest.mark.anyio
+async def test_truncated_completions_are_not_cached(tmp_path):
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return completion("A summ", finish_reason="length")
+
+    integration = make_integration(handler)
+    integration.completion_cache = CompletionCache(str(tmp_path / "cache.db"), ttl=60)
+
+    first = await integration.summarize_text("print('a')")
+    await integration.summarize_text("print('a')")
+
+    assert first["choices"][0]["text"] == "A summ"
+    assert len(requests) == 2
+
+
+def test_review_prompt_templates_follow_config_reloads(monkeypatch):
+    integration = OpenAIIntegration(api_key="test-key", model="gpt-test")
+    reloaded = {
+        **get_config(),
+        "languages": {"Python": {"prompt_template": "Reloaded {language}: {code}"}},
+    }
+    monkeypatch.setattr(openai_integration, "get_config", lambda: reloaded)
+
+    prompt = integration._generate_code_review_prompt("x = 1", "Python", False)
+
+    assert prompt == "Reloaded Python: x = 1"
+
+
+@pytest.mark.anyio
+async def test_batched_reviews_use_the_synchronous_review_parameters():
+    bodies = []
+
+    def handler(request):
+        if request.url.path.endswith("/chat/completions"):
+            bodies.append(json.loads(request.content))
+            return completion("Looks fine.")
+        if request.url.path.endswith("/files"):
+            content = request.read()
+            start = content.index(b'{"custom_id"')
+            line = content[start:content.index(b"\r\n", start)]
+            bodies.append(json.loads(line)["body"])
+            return httpx.Response(
+                200,
+                json={
+                    "id": "file-1",
+                    "object": "file",
+                    "bytes": len(line),
+                    "created_at": 0,
+                    "filename": "batch.jsonl",
+                    "purpose": "batch",
+                    "status": "processed",
+                },
+            )
+        return httpx.Response(
+            200,
+            json={
+                "id": "batch-1",
+                "object": "batch",
+                "endpoint": "/v1/chat/completions",
+                "input_file_id": "file-1",
+                "completion_window": "24h",
+                "status": "validating",
+                "created_at": 0,
+            },
+        )
+
+    integration = make_integration(handler)
+    await integration.review_code("x = 1", language="Python", is_diff=True)
+    batch_id = await integration.create_batch(
+        {"7-0-review": integration.build_review_request("x = 1", "Python", True)}
+    )
+
+    assert batch_id == "batch-1"
+    synchronous, batched = bodies
+    assert batched == synchronous
+    assert synchronous["temperature"] == 0.7
+    assert synchronous["max_tokens"] == 2048
@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+import msgspec
+import pytest
+
+from app.models.openai_schema import (decode_batch_output,
+                                      decode_summary_and_review)
+
+
+def test_decode_batch_output_reads_text_and_errors():
+    content = (
+        b'{"custom_id": "7-0-summary", "error": null, "response": {"status_code": 200,'
+        b' "body": {"id": "c1", "choices": [{"index": 0, "message": {"role": "assistant",'
+        b' "content": "Adds a."}}]}}}\n'
+        b'{"custom_id": "7-0-review", "error": {"code": "server_error"},'
+        b' "response": {"status_code": 500, "body": {"error": {"message": "boom"}}}}\n'
+    )
+
+    assert list(decode_batch_output(content)) == [
+        ("7-0-summary", "Adds a.", None),
+        ("7-0-review", None, {"code": "server_error"}),
+    ]
+
+
+def test_decode_summary_and_review_rejects_missing_fields():
+    result = decode_summary_and_review('{"summary": "s", "review": "r", "extra": 1}')
+    assert (result.summary, result.review) == ("s", "r")
+
+    with pytest.raises(msgspec.ValidationError):
+        decode_summary_and_review('{"summary": "s"}')
@@ -0,0 +1,347 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from app.services import pr_processing
+from app.services.pr_processing import PRProcessor, PRSummary, is_trivial_change
+from app.utilities import token_budget
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+class FakeGitHub:
+    def __init__(self, files):
+        self.files = files
+        self.comments = []
+        self.reviews = []
+
+    async def iter_files_from_pr(self, pr_number, need_full_content=True):
+        for file in self.files:
+            yield file
+
+    async def post_comment_on_pr(self, pr_number, comment):
+        self.comments.append((pr_number, comment))
+
+    async def post_review(self, pr_number, comments, body=""):
+        self.comments.extend((pr_number, comment["body"]) for comment in comments)
+        self.reviews.append(pr_number)
+
+
+class FakeOpenAI:
+    model = "gpt-test"
+
+    def __init__(self):
+        self.reviewed = []
+        self.summarized = []
+
+    async def summarize_files(self, texts, prompt_prefix):
+        self.summarized.append((dict(texts), prompt_prefix))
+        return {filename: f"summary of {filename}" for filename in texts}
+
+    async def summarize_text(self, text, prompt_prefix=""):
+        self.summarized.append((text, prompt_prefix))
+        return {"choices": [{"text": f"summary {len(self.summarized)}"}]}
+
+    async def summarize_and_review(self, code, language="Python", is_diff=False):
+        self.reviewed.append(code)
+        return {"summary": f"summary of {code}", "review": f"review of {code}"}
+
+
+def make_file(filename, content, patch=None):
+    return {
+        "filename": filename,
+        "content": content,
+        "patch": patch,
+        "language": "Python",
+    }
+
+
+@pytest.mark.anyio
+async def test_review_pull_request_comments_on_each_reviewable_file():
+    processor = PRProcessor(user_login="alice", repo_full_name="octo/repo", gpt_model=None)
+    processor.gh_client = FakeGitHub(
+        [
+            make_file("a.py", "print('a')"),
+            make_file("empty.py", ""),
+            make_file("b.py", "print('b')"),
+        ]
+    )
+    processor.openai_integration = FakeOpenAI()
+
+    await processor.review_pull_request(7)
+
+    assert sorted(processor.openai_integration.reviewed) == ["print('a')", "print('b')"]
+    assert [pr for pr, _ in processor.gh_client.comments] == [7, 7]
+    assert processor.gh_client.reviews == [7]
+    assert any(
+        "Filename: a.py" in comment
+        and "Language: Python" in comment
+        and "review of print('a')" in comment
+        for _, comment in processor.gh_client.comments
+    )
+
+
+@pytest.mark.anyio
+async def test_identical_files_share_one_completion():
+    processor = PRProcessor(user_login="alice", repo_full_name="octo/repo", gpt_model=None)
+    processor.gh_client = FakeGitHub(
+        [
+            make_file("vendor/a/lib.py", "print('same')"),
+            make_file("vendor/b/lib.py", "print('same')"),
+        ]
+    )
+    processor.openai_integration = FakeOpenAI()
+
+    await processor.review_pull_request(7)
+    await processor.review_pull_request(8)
+
+    assert processor.openai_integration.reviewed == ["print('same')"]
+    assert len(processor.gh_client.comments) == 4
+
+
+@pytest.mark.anyio
+async def test_oversized_file_is_summarized_in_chunks(monkeypatch):
+    monkeypatch.setattr(token_budget, "_get_encoding", lambda model: None)
+    monkeypatch.setattr(pr_processing, "SUMMARY_CHUNK_TOKENS", 100)
+    monkeypatch.setattr(pr_processing, "SUMMARY_CHUNK_OVERLAP_TOKENS", 10)
+    processor = PRProcessor(user_login="alice", repo_full_name="octo/repo", gpt_model=None)
+    processor.openai_integration = FakeOpenAI()
+
+    summary = await processor._summarize_file(
+        make_file("big.py", "x = 1\n" * 200), process_diffs_only=False
+    )
+
+    calls = processor.openai_integration.summarized
+    assert len(calls) == 5
+    assert [len(text) for text, _ in calls[:4]] == [400, 400, 400, 120]
+    assert "part 1 of 4" in calls[0][1]
+    assert "Part 4:" in calls[4][0] and calls[4][1].startswith("Combine")
+    assert summary == "summary 5"
+
+
+@pytest.mark.anyio
+async def test_open_pull_requests_are_reviewed_concurrently_within_bound():
+    processor = PRProcessor(user_login="alice", repo_full_name="octo/repo", gpt_model=None)
+    processor.max_concurrency = 2
+    in_flight = peak = 0
+
+    async def fetch_open_pull_requests():
+        return [{"number": number} for number in range(1, 6)]
+
+    async def review_pull_request(pr_number, process_diffs_only=False):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        if pr_number == 3:
+            raise RuntimeError("boom")
+
+    processor.gh_client.fetch_open_pull_requests = fetch_open_pull_requests
+    processor.review_pull_request = review_pull_request
+
+    assert await processor.review_all_open_pull_requests() == "OK"
+    assert peak == 2
+
+
+@pytest.mark.anyio
+async def test_trivial_diffs_skip_completions():
+    processor = PRProcessor(user_login="alice", repo_full_name="octo/repo", gpt_model=None)
+    processor.openai_integration = FakeOpenAI()
+    bump = make_file("setup.py", "", patch="@@ -1 +1 @@\n-version = '1.0'\n+version = '1.1'")
+    reformat = make_file(
+        "a.js", "", patch="@@ -1 +1 @@\n-if (x) return y;\n+    if (x) return y;  "
+    )
+    reformat["language"] = "JavaScript"
+
+    assert await processor._summarize_file(bump, process_diffs_only=True) == bump["patch"]
+    assert await processor._review_file(reformat, process_diffs_only=True) is None
+    assert processor.openai_integration.summarized == []
+    assert processor.openai_integration.reviewed == []
+
+
+@pytest.mark.anyio
+async def test_small_semantic_diffs_are_reviewed():
+    processor = PRProcessor(user_login="alice", repo_full_name="octo/repo", gpt_model=None)
+    processor.openai_integration = FakeOpenAI()
+    operator = make_file("a.py", "", patch="@@ -1 +1 @@\n-if a < b:\n+if a <= b:")
+    reindent = make_file(
+        "b.py", "", patch="@@ -1,2 +1,2 @@\n if x:\n-    y()\n-z()\n+    y()\n+    z()"
+    )
+    retry = make_file("c.py", "", patch="@@ -1 +1 @@\n-retries = 3\n+retries = 0")
+
+    for file in (operator, reindent, retry):
+        assert await processor._review_file(file, process_diffs_only=True) is not None
+    assert processor.openai_integration.reviewed == [
+        operator["patch"],
+        reindent["patch"],
+        retry["patch"],
+    ]
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize(
+    ("filename", "removed", "added"),
+    [
+        ("a.py", "THRESHOLD = 0.95", "THRESHOLD = 0.05"),
+        ("a.py", "timeout = 1.5", "timeout = 150.0"),
+        ("a.py", 'ip = "10.0.0.1"', 'ip = "0.0.0.0"'),
+        ("a.js", "return a;", "returna;"),
+        ("a.js", 'msg = "a b"', 'msg = "ab"'),
+    ],
+)
+async def test_lookalike_trivial_diffs_are_reviewed(filename, removed, added):
+    processor = PRProcessor(user_login="alice", repo_full_name="octo/repo", gpt_model=None)
+    processor.openai_integration = FakeOpenAI()
+    file = make_file(filename, "", patch=f"@@ -1 +1 @@\n-{removed}\n+{added}")
+
+    assert await processor._review_file(file, process_diffs_only=True) is not None
+    assert processor.openai_integration.reviewed == [file["patch"]]
+
+
+def test_version_bumps_are_trivial_in_manifests_or_on_version_keys():
+    assert is_trivial_change("-requests==2.31.0\n+requests==2.32.0", "Text", "requirements-dev.txt")
+    assert is_trivial_change(
+        "-__version__ = '1.2.3'\n+__version__ = '1.2.4'", "Python", "app/__init__.py"
+    )
+    assert not is_trivial_change("-ratio = 1.2.3\n+ratio = 1.2.4", "Python", "app/config.py")
+
+
+@pytest.mark.anyio
+async def test_generate_pr_summary_posts_and_returns_summary():
+    processor = PRProcessor(user_login="alice", repo_full_name="octo/repo", gpt_model=None)
+    processor.gh_client = FakeGitHub([make_file("a.py", "print('a')")])
+    processor.openai_integration = FakeOpenAI()
+
+    pr_summary = await processor.generate_pr_summary(7)
+
+    assert pr_summary == PRSummary(7, "summary 2")
+    assert pr_summary.as_response() == {"PR #": 7, "Summary": "summary 2"}
+    assert processor.gh_client.comments == [(7, "summary 2")]
+
+
+def test_processors_share_the_openai_integration_per_model():
+    first = PRProcessor(user_login="alice", repo_full_name="octo/repo", gpt_model="gpt-4")
+    second = PRProcessor(user_login="bob", repo_full_name="octo/other", gpt_model="gpt-4")
+
+    assert first.openai_integration is second.openai_integration
+
+
+@pytest.mark.anyio
+async def test_small_files_are_summarized_together(monkeypatch):
+    monkeypatch.setattr(pr_processing, "SUMMARY_BATCH_CHARS", 400)
+    processor = PRProcessor(user_login="alice", repo_full_name="octo/repo", gpt_model=None)
+    processor.gh_client = FakeGitHub(
+        [
+            make_file("a.txt", "a" * 60),
+            make_file("big.txt", "b" * 200),
+            make_file("c.txt", "c" * 60),
+        ]
+    )
+    processor.openai_integration = FakeOpenAI()
+
+    await processor.generate_pr_summary(7)
+
+    calls = processor.openai_integration.summarized
+    grouped = [texts for texts, _ in calls if isinstance(texts, dict)]
+    assert grouped == [{"a.txt": "a" * 60, "c.txt": "c" * 60}]
+    assert ("b" * 200) in [text for text, _ in calls]
+    combined = calls[-1][0]
+    assert "Filename: a.txt\nsummary of a.txt" in combined
+    assert combined.index("a.txt") < combined.index("big.txt") < combined.index("c.txt")
+
+
+@pytest.mark.anyio
+async def test_review_batch_keeps_only_what_posting_needs():
+    processor = PRProcessor(user_login="alice", repo_full_name="octo/repo", gpt_model=None)
+    processor.gh_client = FakeGitHub(
+        [make_file("a.py", "print('a')", patch="+print('a')"), make_file("b.py", "")]
+    )
+
+    async def fetch_open_pull_requests():
+        return [{"number": 7}]
+
+    class BatchOpenAI(FakeOpenAI):
+        def build_summary_messages(self, text, prompt_prefix):
+            return [{"role": "user", "content": text}]
+
+        def build_review_request(self, code, language, is_diff):
+            return {"messages": [{"role": "user", "content": f"{language}: {code}"}]}
+
+        async def create_batch(self, requests):
+            self.batch = requests
+            return "batch-1"
+
+    processor.gh_client.fetch_open_pull_requests = fetch_open_pull_requests
+    processor.openai_integration = BatchOpenAI()
+
+    batch_id, targets = await processor.submit_review_batch()
+
+    assert batch_id == "batch-1"
+    assert sorted(processor.openai_integration.batch) == ["7-0-review", "7-0-summary"]
+    assert targets == {
+        "7-0": (7, {"filename": "a.py", "language": "Python", "patch": "+print('a')"})
+    }
+
+
+@pytest.mark.anyio
+async def test_review_batch_is_not_submitted_without_reviewable_files():
+    processor = PRProcessor(user_login="alice", repo_full_name="octo/repo", gpt_model=None)
+    processor.gh_client = FakeGitHub([make_file("empty.py", "")])
+
+    async def fetch_open_pull_requests():
+        return [{"number": 7}]
+
+    class BatchOpenAI(FakeOpenAI):
+        async def create_batch(self, requests):
+            raise AssertionError("an empty batch was submitted")
+
+    processor.gh_client.fetch_open_pull_requests = fetch_open_pull_requests
+    processor.openai_integration = BatchOpenAI()
+
+    assert await processor.submit_review_batch() == (None, {})
+
+
+@pytest.mark.anyio
+async def test_files_without_a_review_prompt_are_not_reviewed():
+    processor = PRProcessor(user_login="alice", repo_full_name="octo/repo", gpt_model=None)
+    processor.openai_integration = FakeOpenAI()
+    page = make_file("force-app/main/default/pages/Home.page", "<apex:page/>")
+    page["language"] = "Salesforce Visualforce"
+    unknown = make_file("data.bin2", "\x00\x01")
+    unknown["language"] = "Unknown"
+
+    assert await processor._review_file(page, process_diffs_only=False) is None
+    assert await processor._review_file(unknown, process_diffs_only=False) is None
+    assert processor.openai_integration.reviewed == []
+
+
+@pytest.mark.anyio
+async def test_python_diffs_and_unparsable_code_are_summarized_unminified(monkeypatch):
+    monkeypatch.setattr(pr_processing, "SUMMARY_BATCH_CHARS", 400)
+    patch = "@@ -1,2 +1,2 @@\n def f():\n-    return 1\n+    return 2"
+    processor = PRProcessor(user_login="alice", repo_full_name="octo/repo", gpt_model=None)
+    processor.gh_client = FakeGitHub(
+        [
+            make_file("a.py", "", patch=patch),
+            make_file("b.py", "", patch=patch.replace("2", "3")),
+            make_file("big.py", "", patch=patch + "\n+# " + "x" * 200),
+        ]
+    )
+    processor.openai_integration = FakeOpenAI()
+
+    await processor.generate_pr_summary(7, process_diffs_only=True)
+
+    texts = [text for text, _ in processor.openai_integration.summarized]
+    assert {"a.py": patch, "b.py": patch.replace("2", "3")} in texts
+    assert patch + "\n+# " + "x" * 200 in texts
+
+    processor.gh_client = FakeGitHub([make_file("broken.py", "def broken(:\n    pass\n")])
+    processor.openai_integration = FakeOpenAI()
+    await processor.generate_pr_summary(8)
+    assert processor.openai_integration.summarized[0][0] == "def broken(:\n    pass\n"
@@ -1,9 +1,15 @@
 from __future__ import annotations
 
+import asyncio
+import os
+import signal
+
 import pytest
 from httpx import AsyncClient
 from httpx._transports.asgi import ASGITransport
 
+from app import main
+from app.api.dependencies import get_pr_processor
 from app.main import app
 
 
@@ -15,3 +21,43 @@ async def test_status_endpoint():
         response = await ac.get("/status/")
     assert response.status_code == 200
     assert "status" in response.json()
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("anyio_backend", ["asyncio"])
+@pytest.mark.skipif(not hasattr(signal, "SIGHUP"), reason="no SIGHUP on this platform")
+async def test_lifespan_reloads_config_on_sighup(anyio_backend, monkeypatch):
+    reloads = []
+    monkeypatch.setattr(main, "reload_config", lambda: reloads.append(True))
+
+    async with main.lifespan(app):
+        os.kill(os.getpid(), signal.SIGHUP)
+        await asyncio.sleep(0.05)
+
+    assert reloads == [True]
+    assert signal.getsignal(signal.SIGHUP) == signal.SIG_DFL
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("anyio_backend", ["asyncio"])
+async def test_batch_review_without_reviewable_files_submits_nothing(anyio_backend):
+    class EmptyProcessor:
+        async def submit_review_batch(self, process_diffs_only):
+            return None, {}
+
+        async def post_batch_reviews(self, *args):
+            raise AssertionError("results of an unsubmitted batch were awaited")
+
+    app.dependency_overrides[get_pr_processor] = EmptyProcessor
+    try:
+        async with AsyncClient(
+            transport=ASGITransport(app=app), base_url="http://test"
+        ) as ac:
+            response = await ac.post(
+                "/review_all_open_PRs/?mode=batch", json={"repository_name": "octo/repo"}
+            )
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == 200
+    assert response.json() == {"batch_id": None}
@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+import pytest
+
+from app.utilities import token_budget
+from app.utilities.token_budget import (DEFAULT_CONTEXT_TOKENS, context_window,
+                                        input_budget, truncate_to_tokens)
+
+
+@pytest.fixture(autouse=True)
+def no_tokenizer(monkeypatch):
+    # Encodings are downloaded on first use; exercise the length-based estimate.
+    monkeypatch.setattr(token_budget, "_get_encoding", lambda model: None)
+    token_budget.count_prompt_tokens.cache_clear()
+
+
+def test_context_window_matches_longest_prefix():
+    assert context_window("gpt-4-32k-0613") == 32768
+    assert context_window("gpt-4-0613") == 8192
+    assert context_window("gpt-4o-mini") == 128000
+    assert context_window("unknown-model") == DEFAULT_CONTEXT_TOKENS
+
+
+def test_input_budget_subtracts_prompt_and_response():
+    assert input_budget("gpt-4", "x" * 400) < input_budget("gpt-4")
+    assert input_budget("gpt-4") - input_budget("gpt-4", "x" * 400) == 100
+
+
+def test_truncate_to_tokens_keeps_short_text():
+    assert truncate_to_tokens("short", 10, "gpt-4") == "short"
+    assert truncate_to_tokens("a" * 100, 10, "gpt-4") == "a" * 40
@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+import msgspec
+import pytest
+
+from app.models.github_webhook_schema import decode_webhook_payload
+
+
+def test_decode_webhook_payload_reads_nested_fields():
+    body = (
+        b'{"action": "opened",'
+        b' "repository": {"full_name": "octo/repo", "owner": {"login": "octo"}, "private": false},'
+        b' "sender": {"login": "alice", "id": 1},'
+        b' "pull_request": {"number": 7, "title": "Fix", "head": {"sha": "abc"}}}'
+    )
+    payload = decode_webhook_payload(body)
+
+    assert payload.repository.full_name == "octo/repo"
+    assert payload.sender.login == "alice"
+    assert payload.pull_request.number == 7
+
+
+def test_decode_webhook_payload_rejects_missing_fields():
+    with pytest.raises(msgspec.ValidationError):
+        decode_webhook_payload(b'{"repository": {"full_name": "octo/repo"}}')